@@ -1,24 +1,100 @@
 """AI client for OpenAI-compatible API."""
 import asyncio
+import hashlib
 import logging
 import os
-from typing import List, Dict, Any, Optional
+import random
+import time
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
-import aiohttp
-from dotenv import load_dotenv
-from tenacity import retry, stop_after_attempt, wait_exponential
+import numpy as np
+import orjson
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    import aiohttp
+
+# Deferred to first session use so importing this module stays cheap.
+# Environment loading (dotenv) is the entrypoint's responsibility.
+aiohttp = None
 
 logger = logging.getLogger(__name__)
 
+__all__ = ["AIClient", "AIServerError", "ai_client"]
+
+
+class AIServerError(Exception):
+    """Retryable server-side failure (rate limit or 5xx)."""
+
+
+# Response cache bounds for deterministic (temperature=0) chat calls
+_CHAT_CACHE_MAX = 1024
+_CHAT_CACHE_TTL = 600  # seconds
+
+# Embedding cache bounds: embeddings are deterministic per (model, text),
+# and the same short texts recur constantly (re-indexing, retries)
+_EMBED_CACHE_MAX = 2000
+_EMBED_CACHE_TTL = 600  # seconds
+
+_MAX_RETRIES = 3
+
+# One session (and thus one connection pool) shared by every AIClient
+# instance, so stray constructions (e.g. in tests) can't fragment the pool
+_session: Optional["aiohttp.ClientSession"] = None
+_session_lock = asyncio.Lock()
+
+
+async def _shared_session() -> "aiohttp.ClientSession":
+    """Get the process-wide client session, creating it on first use."""
+    global aiohttp, _session
+
+    if aiohttp is None:
+        import aiohttp
+
+    if _session is None or _session.closed:
+        async with _session_lock:
+            # Double-check after acquiring the lock
+            if _session is None or _session.closed:
+                _session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=100,
+                        limit_per_host=32,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=60
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=30, connect=5)
+                )
+    return _session
+
+
+async def close_shared_session() -> None:
+    """Close the process-wide session at shutdown."""
+    if _session and not _session.closed:
+        await _session.close()
+
+
+def _retry_delay(headers, attempt: int) -> float:
+    """Backoff delay honoring Retry-After when the server provides one."""
+    try:
+        delay = float(headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        delay = 0.0
+
+    if delay <= 0:
+        delay = min(2 ** attempt, 10)
+
+    return delay + random.uniform(0, 0.25)
+
 
 class AIClient:
     """Client for OpenAI-compatible AI API."""
     
     def __init__(self):
-        """Initialize AI client."""
+        """Initialize AI client.
+
+        A single ClientSession is created lazily and reused for every
+        request; creating a session per request is an anti-pattern per the
+        aiohttp docs and pays a TCP+TLS handshake on each call.
+        """
         self.base_url = os.getenv("OPENAI_COMPAT_BASE", "https://samuraiapi.in/v1")
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.model = os.getenv("MODEL_NAME", "groq/moonshotai/kimi-k2-instruct")
@@ -35,23 +111,41 @@ class AIClient:
                 if 'API' in key.upper():
                     logger.info(f"{key}: {'*' * len(value) if value else 'Not set'}")
             raise ValueError("OPENAI_API_KEY environment variable is required")
-        
-        self.session = None
-    
+
+        # Frozen per-call constants: no f-strings or dict builds per request
+        self._chat_url = f"{self.base_url}/chat/completions"
+        self._embed_url = f"{self.base_url}/embeddings"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        # Completion cache for deterministic prompts, plus in-flight futures
+        # so concurrent identical requests collapse into one API call
+        self._chat_cache: Dict[str, tuple] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Per-text embedding cache keyed by content digest; insertion
+        # order doubles as the eviction order, like the chat cache
+        self._embed_cache: Dict[bytes, tuple] = {}
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the session shared across all AIClient instances."""
+        return await _shared_session()
+
+    async def close(self) -> None:
+        """Close the shared session at shutdown."""
+        await close_shared_session()
+
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession()
+        await self._get_session()
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
-            await self.session.close()
-    
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
+        await self.close()
+
     async def chat(
         self,
         messages: List[Dict[str, str]],
@@ -60,9 +154,64 @@ class AIClient:
         max_tokens: int = 800,
         **kwargs
     ) -> str:
-        """Send chat request to AI API."""
+        """Send chat request to AI API.
+
+        Deterministic calls (temperature=0) are served from a small TTL
+        cache, and concurrent identical requests are coalesced into a
+        single API call.
+        """
         model = model or self.model
-        
+
+        # Sampling responses vary between calls, so only cache temperature=0
+        if temperature > 0 or kwargs:
+            return await self._chat_request(
+                messages, model, temperature, max_tokens, **kwargs
+            )
+
+        key = hashlib.blake2b(
+            orjson.dumps((model, messages, temperature, max_tokens))
+        ).hexdigest()
+
+        cached = self._chat_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._chat_request(
+                messages, model, temperature, max_tokens, **kwargs
+            )
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved to avoid warnings
+            raise
+        else:
+            future.set_result(response)
+            if len(self._chat_cache) >= _CHAT_CACHE_MAX:
+                self._chat_cache.pop(next(iter(self._chat_cache)))
+            self._chat_cache[key] = (time.monotonic() + _CHAT_CACHE_TTL, response)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _chat_request(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        **kwargs
+    ) -> str:
+        """Perform the chat completion HTTP request with inline retry.
+
+        Rate limits honor the server's Retry-After header (with jitter);
+        5xx and transport errors fall back to exponential backoff.
+        """
         payload = {
             "model": model,
             "messages": messages,
@@ -70,72 +219,221 @@ class AIClient:
             "max_tokens": max_tokens,
             **kwargs
         }
-        
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        
-        logger.debug(f"Sending request to {self.base_url}/chat/completions")
-        logger.debug(f"Headers: {dict(headers)}")
+
+        session = await self._get_session()
+
+        logger.debug(f"Sending request to {self._chat_url}")
         logger.debug(f"Payload: {payload}")
-        
-        async with self.session.post(
-            f"{self.base_url}/chat/completions",
-            json=payload,
-            headers=headers
-        ) as response:
-            logger.debug(f"Response status: {response.status}")
-            
-            if response.status == 429:
-                raise Exception("Rate limit exceeded")
-            elif response.status >= 500:
-                raise Exception(f"Server error: {response.status}")
-            elif response.status != 200:
-                error_text = await response.text()
-                raise Exception(f"API error: {response.status} - {error_text}")
-            
-            data = await response.json()
-            
-            if "choices" not in data or not data["choices"]:
-                raise Exception("Invalid response format")
-            
-            return data["choices"][0]["message"]["content"].strip()
+
+        last_error: Optional[Exception] = None
+
+        for attempt in range(_MAX_RETRIES):
+            try:
+                async with session.post(
+                    self._chat_url,
+                    data=orjson.dumps(payload),
+                    headers=self._headers
+                ) as response:
+                    logger.debug(f"Response status: {response.status}")
+
+                    if response.status == 429:
+                        last_error = AIServerError("Rate limit exceeded")
+                        await asyncio.sleep(_retry_delay(response.headers, attempt))
+                        continue
+                    elif response.status >= 500:
+                        last_error = AIServerError(f"Server error: {response.status}")
+                        await asyncio.sleep(min(2 ** attempt, 10) + random.uniform(0, 0.25))
+                        continue
+                    elif response.status != 200:
+                        error_text = await response.text()
+                        raise Exception(f"API error: {response.status} - {error_text}")
+
+                    data = orjson.loads(await response.read())
+
+                    if "choices" not in data or not data["choices"]:
+                        raise Exception("Invalid response format")
+
+                    return data["choices"][0]["message"]["content"].strip()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+                await asyncio.sleep(min(2 ** attempt, 10) + random.uniform(0, 0.25))
+
+        raise last_error
     
-    async def embed(self, texts: List[str], model: str = "groq/moonshotai/kimi-k2-instruct") -> List[List[float]]:
-        """Get embeddings for texts."""
+    async def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 800,
+        **kwargs
+    ):
+        """Stream chat completion deltas as they are generated.
+
+        Yields content fragments parsed from the SSE stream, so callers
+        can render partial responses instead of waiting for the full
+        completion.
+        """
+        model = model or self.model
+
         payload = {
             "model": model,
-            "input": texts
-        }
-        
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            **kwargs
         }
-        
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        
-        async with self.session.post(
-            f"{self.base_url}/embeddings",
-            json=payload,
-            headers=headers
+
+        session = await self._get_session()
+
+        async with session.post(
+            self._chat_url,
+            data=orjson.dumps(payload),
+            headers=self._headers
         ) as response:
             if response.status != 200:
                 error_text = await response.text()
-                raise Exception(f"Embedding API error: {response.status} - {error_text}")
-            
-            data = await response.json()
-            
-            if "data" not in data:
-                raise Exception("Invalid embedding response format")
-            
-            return [item["embedding"] for item in data["data"]]
+                raise Exception(f"API error: {response.status} - {error_text}")
+
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data: "):
+                    continue
+
+                chunk = line[6:]
+                if chunk == "[DONE]":
+                    break
+
+                delta = orjson.loads(chunk)["choices"][0]["delta"].get("content")
+                if delta:
+                    yield delta
+
+    async def embed(self, texts: List[str], model: str = "groq/moonshotai/kimi-k2-instruct") -> np.ndarray:
+        """Get embeddings for texts as a float32 (n, dim) array.
+
+        Each text is cached individually (keyed by a digest of model and
+        content) with a TTL, so repeat embeds skip the API entirely and
+        mixed batches only send the cache misses. float32 halves memory
+        against Python float lists and is what the vector store consumes
+        anyway, so nothing downstream pays a conversion.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        now = time.monotonic()
+        keys = [
+            hashlib.blake2b(f"{model}\x00{text}".encode(), digest_size=16).digest()
+            for text in texts
+        ]
+
+        rows: List[Optional[np.ndarray]] = [None] * len(texts)
+        misses: List[int] = []
+        for i, key in enumerate(keys):
+            cached = self._embed_cache.get(key)
+            if cached and cached[0] > now:
+                rows[i] = cached[1]
+            else:
+                misses.append(i)
+
+        if misses:
+            fetched = await self._embed_request([texts[i] for i in misses], model)
+            expires = time.monotonic() + _EMBED_CACHE_TTL
+            for i, embedding in zip(misses, fetched):
+                if len(self._embed_cache) >= _EMBED_CACHE_MAX:
+                    self._embed_cache.pop(next(iter(self._embed_cache)))
+                self._embed_cache[keys[i]] = (expires, embedding)
+                rows[i] = embedding
+
+        return np.stack(rows)
+
+    async def _embed_request(self, texts: List[str], model: str) -> np.ndarray:
+        """Perform the embeddings HTTP request with inline retry."""
+        payload = {
+            "model": model,
+            "input": texts
+        }
+
+        session = await self._get_session()
+
+        last_error: Optional[Exception] = None
+
+        for attempt in range(_MAX_RETRIES):
+            try:
+                async with session.post(
+                    self._embed_url,
+                    data=orjson.dumps(payload),
+                    headers=self._headers
+                ) as response:
+                    if response.status == 429:
+                        last_error = AIServerError("Rate limit exceeded")
+                        await asyncio.sleep(_retry_delay(response.headers, attempt))
+                        continue
+                    elif response.status >= 500:
+                        last_error = AIServerError(f"Server error: {response.status}")
+                        await asyncio.sleep(min(2 ** attempt, 10) + random.uniform(0, 0.25))
+                        continue
+                    elif response.status != 200:
+                        error_text = await response.text()
+                        raise Exception(f"Embedding API error: {response.status} - {error_text}")
+
+                    data = orjson.loads(await response.read())
+
+                    if "data" not in data:
+                        raise Exception("Invalid embedding response format")
+
+                    rows = data["data"]
+                    if not rows:
+                        return np.empty((0, 0), dtype=np.float32)
+
+                    # Fill a preallocated buffer row by row: no
+                    # intermediate list-of-lists and no second pass
+                    # over the floats to build the final array
+                    out = np.empty(
+                        (len(rows), len(rows[0]["embedding"])),
+                        dtype=np.float32
+                    )
+                    for i, item in enumerate(rows):
+                        out[i] = item["embedding"]
+                    return out
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+                await asyncio.sleep(min(2 ** attempt, 10) + random.uniform(0, 0.25))
+
+        raise last_error
     
+    async def embed_many(
+        self,
+        texts: List[str],
+        batch_size: int = 256,
+        max_concurrency: int = 5,
+        model: str = "groq/moonshotai/kimi-k2-instruct"
+    ) -> np.ndarray:
+        """Embed many texts by dispatching batches concurrently.
+
+        Batches are limited by a semaphore so at most `max_concurrency`
+        requests are in flight; results preserve input order.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _run(index: int, batch: List[str]):
+            async with semaphore:
+                return index, await self.embed(batch, model=model)
+
+        results = await asyncio.gather(
+            *[_run(i, batch) for i, batch in enumerate(batches)]
+        )
+
+        out: List[Optional[np.ndarray]] = [None] * len(batches)
+        for index, embeddings in results:
+            out[index] = embeddings
+
+        return np.concatenate(out)
+
     async def health_check(self) -> bool:
         """Check if AI API is available."""
         try:
@@ -149,5 +447,16 @@ class AIClient:
             return False
 
 
-# Global instance
-ai_client = AIClient()
\ No newline at end of file
+# Global instance, constructed lazily on first attribute access so that
+# importing this module (e.g. during test collection) stays cheap
+_ai_client: Optional[AIClient] = None
+
+
+def __getattr__(name: str):
+    """Lazily construct the module-level client singleton."""
+    if name == "ai_client":
+        global _ai_client
+        if _ai_client is None:
+            _ai_client = AIClient()
+        return _ai_client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,410 @@
+"""Unified configuration store backing both legacy config managers."""
+import asyncio
+import copy
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Parsed JSON keyed by path, invalidated on (st_mtime_ns, st_size) change
+_JSON_CACHE: Dict[str, tuple] = {}
+
+
+def _read_json_cached(path: Path) -> Any:
+    """Read and parse a JSON file, reusing the parse when unchanged on disk."""
+    st = path.stat()
+    key = str(path)
+    cached = _JSON_CACHE.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    with open(path, 'rb') as f:
+        data = orjson.loads(f.read())
+
+    _JSON_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def clear_json_cache() -> None:
+    """Drop all cached JSON parses (mainly for tests and forced reloads)."""
+    _JSON_CACHE.clear()
+
+
+# Module-frozen defaults; instances only ever receive deep copies so
+# runtime mutations can't leak back into the template's nested dicts
+_DEFAULT_DATA_TEMPLATE = {
+    "system_prompts": {},
+    "bot_settings": {
+        "max_response_length": 800,
+        "temperature": 0.7,
+        "top_p": 0.9,
+        "frequency_penalty": 0.0,
+        "presence_penalty": 0.0,
+        "offline_mode": False,
+        "reply_when_offline": False,
+        "owner_commands": True,
+        "auto_reply_enabled": True,
+        "easy_config_update": True
+    },
+    "user_configs": {},
+    "workflows": {},
+    "training_data": {}
+}
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """Serialize an object to pretty-printed JSON on disk atomically.
+
+    Writes a temp file in the same directory and os.replace()s it over
+    the target so readers never observe a torn write.
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    os.replace(tmp, path)
+
+
+class UnifiedConfigStore:
+    """Single file-backed store for prompts, settings, workflows and training data.
+
+    Replaces the former SystemConfig/SystemDataManager pair, which kept
+    two copies of the same prompt and bot-setting state across two file
+    sets and parsed both at startup. One in-memory dict now backs both
+    legacy APIs; the old singletons remain as aliases of this store.
+    """
+
+    def __init__(self, config_dir: str = "config"):
+        """Initialize the unified store."""
+        self.config_dir = Path(config_dir)
+        self.config_dir.mkdir(exist_ok=True)
+
+        # Unified on-disk layout
+        self.prompts_file = self.config_dir / "prompts.json"
+        self.user_configs_file = self.config_dir / "user_configs.json"
+        self.workflows_file = self.config_dir / "workflows.json"
+        self.system_data_file = self.config_dir / "system_data.json"
+
+        # Legacy SystemConfig files, merged read-only on load
+        self.system_prompts_file = self.config_dir / "system_prompts.json"
+        self.bot_settings_file = self.config_dir / "bot_settings.json"
+
+        self.default_data = self._load_default_data()
+
+        # Sections are materialized on first access so callers that only
+        # touch bot_settings never pay for parsing the other files
+        self._sections: Dict[str, Any] = {}
+
+        # Dirty sections awaiting a coalesced flush
+        self._dirty: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _load_default_data(self) -> Dict[str, Any]:
+        """Load default configuration data."""
+        return copy.deepcopy(_DEFAULT_DATA_TEMPLATE)
+
+    def _section(self, name: str) -> Any:
+        """Get one config section, materializing it on first access."""
+        if name not in self._sections:
+            self._sections[name] = self._load_section(name)
+        return self._sections[name]
+
+    def _load_section(self, name: str) -> Any:
+        """Load a single section from disk, merging legacy file locations."""
+        # Deep copy: a shallow one would let updates leak into the defaults
+        section = copy.deepcopy(_DEFAULT_DATA_TEMPLATE[name])
+
+        if name in ("bot_settings", "training_data"):
+            # Legacy file first so the unified layout wins on conflicts
+            if name == "bot_settings" and self.bot_settings_file.exists():
+                try:
+                    section.update(_read_json_cached(self.bot_settings_file))
+                except Exception as e:
+                    logger.warning(f"Could not load {self.bot_settings_file.name}: {e}")
+
+            if self.system_data_file.exists():
+                try:
+                    section.update(_read_json_cached(self.system_data_file).get(name, {}))
+                except Exception as e:
+                    logger.warning(f"Could not load system data: {e}")
+        else:
+            sources = {
+                "system_prompts": (self.system_prompts_file, self.prompts_file),
+                "user_configs": (self.user_configs_file,),
+                "workflows": (self.workflows_file,)
+            }[name]
+
+            for path in sources:
+                if path.exists():
+                    try:
+                        section.update(_read_json_cached(path))
+                    except Exception as e:
+                        logger.warning(f"Could not load {path.name}: {e}")
+
+        return section
+
+    # Back-compat views over the one in-memory dict
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Full config dict with every section materialized."""
+        for name in self.default_data:
+            self._section(name)
+        return self._sections
+
+    @data.setter
+    def data(self, value: Dict[str, Any]):
+        self._sections = value
+
+    @property
+    def current_config(self) -> Dict[str, Any]:
+        """Legacy SystemConfig view of the store."""
+        return self.data
+
+    @property
+    def current_data(self) -> Dict[str, Any]:
+        """Legacy SystemDataManager view of the store."""
+        return self.data
+
+    @property
+    def default_config(self) -> Dict[str, Any]:
+        """Legacy SystemConfig default alias."""
+        return self.default_data
+
+    def get_system_prompt(self, mode: str = "default") -> str:
+        """Get system prompt for specified mode."""
+        return self._section("system_prompts").get(mode, "You are a helpful AI assistant.")
+
+    def update_system_prompt(self, mode: str, prompt: str):
+        """Update system prompt for a mode."""
+        self._section("system_prompts")[mode] = prompt
+        self._mark_dirty("prompts")
+
+    def update_bot_setting(self, key: str, value: Any):
+        """Update bot setting."""
+        self._section("bot_settings")[key] = value
+        self._mark_dirty("system_data")
+
+    def get_bot_setting(self, key: str, default: Any = None) -> Any:
+        """Get bot setting value."""
+        return self._section("bot_settings").get(key, default)
+
+    def update_user_config(self, user_id: int, key: str, value: Any):
+        """Update user-specific configuration."""
+        if str(user_id) not in self._section("user_configs"):
+            self._section("user_configs")[str(user_id)] = {}
+        self._section("user_configs")[str(user_id)][key] = value
+        self._mark_dirty("user_configs")
+
+    def get_user_config(self, user_id: int, key: str, default: Any = None) -> Any:
+        """Get user-specific configuration."""
+        user_str = str(user_id)
+        if user_str in self._section("user_configs"):
+            return self._section("user_configs")[user_str].get(key, default)
+        return default
+
+    def update_workflow(self, name: str, workflow: Dict[str, Any]):
+        """Update workflow."""
+        self._section("workflows")[name] = workflow
+        self._mark_dirty("workflows")
+
+    def update_training_data(self, category: str, data: List[Dict[str, Any]]):
+        """Update training data."""
+        self._section("training_data")[category] = data
+        self._mark_dirty("system_data")
+
+    def get_training_data(self, category: str) -> list:
+        """Get training data for a category."""
+        return self._section("training_data").get(category, [])
+
+    def add_training_example(self, category: str, user_input: str, bot_response: str):
+        """Add training example."""
+        if category not in self._section("training_data"):
+            self._section("training_data")[category] = []
+
+        self._section("training_data")[category].append({
+            "user": user_input,
+            "bot": bot_response
+        })
+        self._mark_dirty("system_data")
+
+    def load_from_txt_file(self, file_path: str) -> bool:
+        """Load configuration from a text file."""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            # Parse simple key-value format
+            lines = content.strip().split('\n')
+            for line in lines:
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    key = key.strip()
+                    value = value.strip()
+
+                    if key.startswith("prompt_"):
+                        mode = key.replace("prompt_", "")
+                        self.update_system_prompt(mode, value)
+                    elif key.startswith("setting_"):
+                        setting = key.replace("setting_", "")
+                        self.update_bot_setting(setting, value)
+                    elif key.startswith("workflow_"):
+                        workflow = key.replace("workflow_", "")
+                        self.update_workflow(workflow, {"name": workflow, "response": value})
+
+            return True
+        except Exception as e:
+            logger.error(f"Could not load from txt file: {e}")
+            return False
+
+    def save_to_txt_file(self, file_path: str) -> bool:
+        """Save configuration to a text file."""
+        try:
+            content = []
+            content.append("# System Prompts")
+            for mode, prompt in self._section("system_prompts").items():
+                content.append(f"prompt_{mode}={prompt}")
+
+            content.append("\n# Bot Settings")
+            for key, value in self._section("bot_settings").items():
+                content.append(f"setting_{key}={value}")
+
+            content.append("\n# Workflows")
+            for name, workflow in self._section("workflows").items():
+                content.append(f"workflow_{name}={workflow.get('response_template', '')}")
+
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(content))
+
+            return True
+        except Exception as e:
+            logger.error(f"Could not save to txt file: {e}")
+            return False
+
+    def reset_to_default(self):
+        """Reset configuration to default."""
+        self.data = copy.deepcopy(_DEFAULT_DATA_TEMPLATE)
+        self._save_data()
+
+    def get_config_summary(self) -> Dict[str, Any]:
+        """Get configuration summary."""
+        return {
+            "system_prompts_count": len(self._section("system_prompts")),
+            "user_configs_count": len(self._section("user_configs")),
+            "workflows_count": len(self._section("workflows")),
+            "training_data_count": len(self._section("training_data")),
+            "bot_settings": self._section("bot_settings"),
+            "config_files": {
+                "system_data": str(self.system_data_file),
+                "prompts": str(self.prompts_file),
+                "user_configs": str(self.user_configs_file),
+                "workflows": str(self.workflows_file)
+            }
+        }
+
+    def _mark_dirty(self, section: str):
+        """Mark a section dirty and schedule a coalesced flush."""
+        self._dirty.add(section)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Schedule a debounced flush, or write immediately without a loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Sync caller (startup, scripts, tests): no loop to defer to
+            self.flush_now()
+            return
+
+        if self._flush_task and not self._flush_task.done():
+            return
+
+        self._flush_task = asyncio.create_task(self._flush_after(0.1))
+
+    async def _flush_after(self, delay: float):
+        """Sleep briefly so bursty updates collapse into one write.
+
+        The write itself runs in the default executor so large training
+        or prompt dumps don't block the event loop.
+        """
+        await asyncio.sleep(delay)
+        await asyncio.get_running_loop().run_in_executor(None, self.flush_now)
+
+    async def reload(self) -> None:
+        """Re-read all sections from disk without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+
+        def _reload() -> Dict[str, Any]:
+            clear_json_cache()
+            return {name: self._load_section(name) for name in self.default_data}
+
+        self._sections = await loop.run_in_executor(None, _reload)
+
+    def flush_now(self):
+        """Write all dirty sections to disk immediately."""
+        dirty, self._dirty = self._dirty, set()
+
+        if "system_data" in dirty:
+            self._save_system_data()
+        if "prompts" in dirty:
+            self._save_prompts()
+        if "user_configs" in dirty:
+            self._save_user_configs()
+        if "workflows" in dirty:
+            self._save_workflows()
+
+    def _save_system_data(self):
+        """Save bot settings and training data to file."""
+        try:
+            _write_json(self.system_data_file, {
+                "bot_settings": self._section("bot_settings"),
+                "training_data": self._section("training_data")
+            })
+        except Exception as e:
+            logger.error(f"Could not save system data: {e}")
+
+    def _save_prompts(self):
+        """Save system prompts to file."""
+        try:
+            _write_json(self.prompts_file, self._section("system_prompts"))
+        except Exception as e:
+            logger.error(f"Could not save prompts: {e}")
+
+    def _save_user_configs(self):
+        """Save user configurations to file."""
+        try:
+            _write_json(self.user_configs_file, self._section("user_configs"))
+        except Exception as e:
+            logger.error(f"Could not save user configs: {e}")
+
+    def _save_workflows(self):
+        """Save workflows to file."""
+        try:
+            _write_json(self.workflows_file, self._section("workflows"))
+        except Exception as e:
+            logger.error(f"Could not save workflows: {e}")
+
+    def _save_data(self):
+        """Save all data to files."""
+        self._save_system_data()
+        self._save_prompts()
+        self._save_user_configs()
+        self._save_workflows()
+
+
+# Global instance shared by the legacy system_config/system_data aliases,
+# constructed lazily on first attribute access
+_config_store: Optional[UnifiedConfigStore] = None
+
+
+def __getattr__(name: str):
+    """Lazily construct the module-level store singleton."""
+    if name == "config_store":
+        global _config_store
+        if _config_store is None:
+            _config_store = UnifiedConfigStore()
+        return _config_store
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
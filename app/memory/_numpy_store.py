@@ -0,0 +1,123 @@
+"""In-process NumPy vector store for runs that need no persistence."""
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class NumpyVectorStore:
+    """Brute-force cosine store behind the Chroma collection API subset.
+
+    At the store sizes a test run (or a small deployment) ever reaches —
+    well under ~100k vectors — one matrix-vector product over a dense
+    float32 block beats an ANN index, and costs none of Chroma's import
+    or startup time. Only the collection methods LongTermMemory actually
+    calls are implemented.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[dict]] = []
+
+    def add(self, ids: List[str], embeddings, metadatas: Optional[List[dict]] = None,
+            documents: Optional[List[str]] = None) -> None:
+        """Append records; embeddings may be any array-like of vectors."""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if self._vectors is None:
+            self._vectors = vectors.copy()
+        else:
+            self._vectors = np.vstack([self._vectors, vectors])
+
+        for i, doc_id in enumerate(ids):
+            self._index[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+            self._documents.append(documents[i] if documents else None)
+            self._metadatas.append(dict(metadatas[i]) if metadatas else None)
+
+    def _match(self, where: Optional[dict]) -> List[int]:
+        """Row indices whose metadata satisfies the equality filter."""
+        if not where:
+            return list(range(len(self._ids)))
+        return [
+            i for i, meta in enumerate(self._metadatas)
+            if meta and all(meta.get(k) == v for k, v in where.items())
+        ]
+
+    def query(self, query_embeddings, n_results: int = 10,
+              where: Optional[dict] = None, include=None) -> dict:
+        """Top-n by inner product, mirroring Chroma's 'ip' space."""
+        rows = self._match(where)
+        out = {'ids': [], 'documents': [], 'metadatas': [], 'distances': []}
+
+        for q in np.asarray(query_embeddings, dtype=np.float32):
+            if not rows:
+                for value in out.values():
+                    value.append([])
+                continue
+
+            scores = self._vectors[rows] @ q
+            order = np.argsort(-scores)[:n_results]
+            picked = [rows[i] for i in order]
+
+            out['ids'].append([self._ids[i] for i in picked])
+            out['documents'].append([self._documents[i] for i in picked])
+            out['metadatas'].append([self._metadatas[i] for i in picked])
+            out['distances'].append([float(1.0 - scores[i]) for i in order])
+
+        return out
+
+    def get(self, ids: Optional[List[str]] = None, where: Optional[dict] = None,
+            limit: Optional[int] = None, include=None) -> dict:
+        """Fetch records by id or metadata filter."""
+        if ids is not None:
+            rows = [self._index[doc_id] for doc_id in ids if doc_id in self._index]
+        else:
+            rows = self._match(where)
+        if limit is not None:
+            rows = rows[:limit]
+
+        result = {
+            'ids': [self._ids[i] for i in rows],
+            'documents': [self._documents[i] for i in rows],
+            'metadatas': [self._metadatas[i] for i in rows],
+        }
+        if include and "embeddings" in include:
+            result['embeddings'] = [self._vectors[i] for i in rows]
+        return result
+
+    def delete(self, ids: List[str]) -> None:
+        """Drop records by id, compacting the vector block."""
+        drop = {doc_id for doc_id in ids if doc_id in self._index}
+        if not drop:
+            return
+
+        keep = [i for i, doc_id in enumerate(self._ids) if doc_id not in drop]
+        self._vectors = self._vectors[keep] if keep else None
+        self._ids = [self._ids[i] for i in keep]
+        self._documents = [self._documents[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._index = {doc_id: i for i, doc_id in enumerate(self._ids)}
+
+
+class NumpyClient:
+    """Stand-in for the chromadb client constructors LongTermMemory uses."""
+
+    def __init__(self):
+        self._collections: Dict[str, NumpyVectorStore] = {}
+
+    def get_or_create_collection(self, name: str,
+                                 metadata: Optional[dict] = None) -> NumpyVectorStore:
+        """Return the named store, creating it on first use.
+
+        The HNSW tuning metadata Chroma accepts has no meaning for a
+        brute-force store and is ignored.
+        """
+        if name not in self._collections:
+            self._collections[name] = NumpyVectorStore(name)
+        return self._collections[name]
@@ -1,5 +1,4 @@
 """User facts storage and management."""
-import json
 import logging
 import re
 from datetime import datetime
@@ -9,29 +8,173 @@ from app.storage.db import Fact, db
 
 logger = logging.getLogger(__name__)
 
+# Each category's patterns are fused into one alternation regex with named
+# groups so a single pass over the message finds all matches
+_NAME_RE = re.compile(
+    r"(?:(?:my name is|i'm|i am|call me)\s+(?P<a>[a-zA-Z]+(?:\s+[a-zA-Z]+)*))"
+    r"|(?:(?:this is|hi,? i'm|hello,? i'm)\s+(?P<b>[a-zA-Z]+(?:\s+[a-zA-Z]+)*))",
+    re.IGNORECASE
+)
+
+_LANGUAGE_RE = re.compile(
+    r"(?:(?:speak|talk|chat|reply)\s+(?:in|using)\s+(?P<a>[a-zA-Z]+))"
+    r"|(?:(?:my language is|i prefer)\s+(?P<b>[a-zA-Z]+))",
+    re.IGNORECASE
+)
+
+_PREFERENCE_RE = re.compile(
+    r"(?:(?:i like|i prefer|i enjoy)\s+(?P<preference>.+?)(?:\.|$))"
+    r"|(?:(?:i don't like|i hate|i dislike)\s+(?P<dislike>.+?)(?:\.|$))"
+    r"|(?:(?:my favorite|my fav)\s+(?P<favorite>.+?)(?:\.|$))",
+    re.IGNORECASE
+)
+
+_GOAL_RE = re.compile(
+    r"(?:(?:i want to|i need to|my goal is to|i'm trying to)\s+(?P<a>.+?)(?:\.|$))"
+    r"|(?:(?:help me|assist me with)\s+(?P<b>.+?)(?:\.|$))",
+    re.IGNORECASE
+)
+
+_TOPICS = [
+    "programming", "python", "javascript", "ai", "machine learning",
+    "data science", "web development", "mobile development",
+    "design", "photography", "music", "travel", "cooking",
+    "fitness", "health", "finance", "investing", "education"
+]
+
+# Topics matched on word boundaries: single words by set membership,
+# two-word topics against the message's adjacent word pairs. Avoids both
+# the per-topic substring scans and false hits like "ai" inside "said".
+_SINGLE_TOPICS = frozenset(t for t in _TOPICS if " " not in t)
+_BIGRAM_TOPICS = frozenset(t for t in _TOPICS if " " in t)
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def _extract_name(message: str) -> List[tuple]:
+    """Extract name from message."""
+    facts = []
+    for match in _NAME_RE.finditer(message):
+        name = match.group("a") or match.group("b")
+        facts.append(("name", name.strip(), 0.9))
+
+    return facts
+
+
+def _extract_language(message: str) -> List[tuple]:
+    """Extract language preference."""
+    facts = []
+    for match in _LANGUAGE_RE.finditer(message):
+        lang = (match.group("a") or match.group("b")).lower()
+        if lang in ["english", "bengali", "bangla", "spanish", "french", "german"]:
+            facts.append(("language", lang, 0.8))
+
+    return facts
+
+
+def _extract_preferences(message: str) -> List[tuple]:
+    """Extract preferences."""
+    facts = []
+    for match in _PREFERENCE_RE.finditer(message):
+        # The matched named group encodes the fact type
+        for fact_type in ("preference", "dislike", "favorite"):
+            value = match.group(fact_type)
+            if value:
+                facts.append((fact_type, value.strip(), 0.7))
+
+    return facts
+
+
+def _extract_goals(message: str) -> List[tuple]:
+    """Extract goals."""
+    facts = []
+    for match in _GOAL_RE.finditer(message):
+        goal = match.group("a") or match.group("b")
+        facts.append(("goal", goal.strip(), 0.6))
+
+    return facts
+
+
+def _extract_topics(message: str) -> List[tuple]:
+    """Extract topics of interest."""
+    words = _WORD_RE.findall(message.lower())
+    word_set = set(words)
+    bigrams = {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+    hits = (_SINGLE_TOPICS & word_set) | (_BIGRAM_TOPICS & bigrams)
+    return [("topic", topic, 0.5) for topic in hits]
+
+
+_EXTRACTORS = (
+    _extract_name,
+    _extract_language,
+    _extract_preferences,
+    _extract_goals,
+    _extract_topics
+)
+
+
+def extract(message: str) -> List[tuple]:
+    """Extract (key, value, confidence) facts from a message.
+
+    Pure function over the module-level precompiled patterns: no store
+    instance or database is needed just to run extraction.
+    """
+    facts: List[tuple] = []
+    for extractor in _EXTRACTORS:
+        try:
+            facts.extend(extractor(message))
+        except Exception as e:
+            logger.warning(f"Error in fact extractor: {e}")
+    return facts
+
 
 class FactsStore:
     """Manages user facts and preferences."""
-    
+
+    # Bound on cached users so the read cache can't grow without limit
+    _CACHE_MAX = 4096
+
     def __init__(self):
         """Initialize facts store."""
-        self.fact_extractors = [
-            self._extract_name,
-            self._extract_language,
-            self._extract_preferences,
-            self._extract_goals,
-            self._extract_topics
-        ]
-    
-    def add_fact(self, user_id: int, key: str, value: str, 
+        # Write-through per-user read cache: facts are pulled on every
+        # message, so reads are served from here until a write for the
+        # same user invalidates the entry. Keyed user -> limit -> rows
+        # since callers ask for different limits.
+        self._cache: Dict[int, Dict[int, List[Fact]]] = {}
+
+    def add_fact(self, user_id: int, key: str, value: str,
                   confidence: float = 1.0) -> None:
         """Add or update a user fact."""
         db.save_fact(user_id, key, value, confidence)
+        self._notify_updated(user_id)
         logger.debug(f"Added fact: {user_id} -> {key} = {value}")
+
+    def add_facts(self, user_id: int, facts: List[tuple]) -> None:
+        """Add or update many facts in one DB round-trip.
+
+        Each entry is a (key, value, confidence) tuple; prefer this
+        over calling add_fact in a loop.
+        """
+        if not facts:
+            return
+        db.save_facts(user_id, facts)
+        self._notify_updated(user_id)
+        logger.debug(f"Added {len(facts)} facts for user {user_id}")
     
     def get_facts(self, user_id: int, limit: int = 10) -> List[Fact]:
-        """Get user facts ordered by confidence."""
-        return db.get_facts(user_id, limit)
+        """Get user facts ordered by confidence, cached until a write."""
+        per_user = self._cache.get(user_id)
+        if per_user is not None and limit in per_user:
+            return per_user[limit]
+
+        facts = db.get_facts(user_id, limit)
+        if per_user is None:
+            if len(self._cache) >= self._CACHE_MAX:
+                self._cache.pop(next(iter(self._cache)))
+            per_user = self._cache[user_id] = {}
+        per_user[limit] = facts
+        return facts
     
     def get_facts_dict(self, user_id: int, limit: int = 10) -> Dict[str, str]:
         """Get facts as a dictionary."""
@@ -39,99 +182,28 @@ class FactsStore:
         return {fact.key: fact.value for fact in facts}
     
     def extract_facts_from_message(self, user_id: int, message: str) -> None:
-        """Extract facts from a user message."""
-        for extractor in self.fact_extractors:
-            try:
-                facts = extractor(message)
-                for key, value, confidence in facts:
-                    self.add_fact(user_id, key, value, confidence)
-            except Exception as e:
-                logger.warning(f"Error in fact extractor: {e}")
-    
-    def _extract_name(self, message: str) -> List[tuple]:
-        """Extract name from message."""
-        patterns = [
-            r"(?:my name is|i'm|i am|call me)\s+([a-zA-Z]+(?:\s+[a-zA-Z]+)*)",
-            r"(?:this is|hi,? i'm|hello,? i'm)\s+([a-zA-Z]+(?:\s+[a-zA-Z]+)*)"
-        ]
-        
-        facts = []
-        for pattern in patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                facts.append(("name", match.strip(), 0.9))
-        
-        return facts
-    
-    def _extract_language(self, message: str) -> List[tuple]:
-        """Extract language preference."""
-        patterns = [
-            r"(?:speak|talk|chat|reply)\s+(?:in|using)\s+([a-zA-Z]+)",
-            r"(?:my language is|i prefer)\s+([a-zA-Z]+)"
-        ]
-        
-        facts = []
-        for pattern in patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                lang = match.lower()
-                if lang in ["english", "bengali", "bangla", "spanish", "french", "german"]:
-                    facts.append(("language", lang, 0.8))
-        
-        return facts
-    
-    def _extract_preferences(self, message: str) -> List[tuple]:
-        """Extract preferences."""
-        patterns = [
-            (r"(?:i like|i prefer|i enjoy)\s+(.+?)(?:\.|$)", "preference"),
-            (r"(?:i don't like|i hate|i dislike)\s+(.+?)(?:\.|$)", "dislike"),
-            (r"(?:my favorite|my fav)\s+(.+?)(?:\.|$)", "favorite")
-        ]
-        
-        facts = []
-        for pattern, fact_type in patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                facts.append((fact_type, match.strip(), 0.7))
-        
-        return facts
-    
-    def _extract_goals(self, message: str) -> List[tuple]:
-        """Extract goals."""
-        patterns = [
-            r"(?:i want to|i need to|my goal is to|i'm trying to)\s+(.+?)(?:\.|$)",
-            r"(?:help me|assist me with)\s+(.+?)(?:\.|$)"
-        ]
-        
-        facts = []
-        for pattern in patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                facts.append(("goal", match.strip(), 0.6))
-        
-        return facts
-    
-    def _extract_topics(self, message: str) -> List[tuple]:
-        """Extract topics of interest."""
-        topics = [
-            "programming", "python", "javascript", "ai", "machine learning",
-            "data science", "web development", "mobile development",
-            "design", "photography", "music", "travel", "cooking",
-            "fitness", "health", "finance", "investing", "education"
-        ]
-        
-        facts = []
-        message_lower = message.lower()
-        
-        for topic in topics:
-            if topic in message_lower:
-                facts.append(("topic", topic, 0.5))
-        
-        return facts
-    
+        """Extract facts from a user message and persist them."""
+        extracted = extract(message)
+
+        # One DB round-trip for all extracted facts instead of one per fact
+        db.save_facts(user_id, extracted)
+        if extracted:
+            self._notify_updated(user_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Extracted {len(extracted)} facts for user {user_id}")
+
+    def _notify_updated(self, user_id: int) -> None:
+        """Drop caches that hold stale facts for this user."""
+        self._cache.pop(user_id, None)
+        # Imported lazily: system_prompts imports this module at top
+        # level, so a top-level import here would be circular
+        from app.training.system_prompts import invalidate_facts_cache
+        invalidate_facts_cache(user_id)
+
     def delete_user_facts(self, user_id: int) -> None:
         """Delete all facts for a user."""
-        # This is handled by the database when deleting user data
+        # The rows themselves go with the rest of the user data wipe
+        self._notify_updated(user_id)
         logger.info(f"Deleted all facts for user {user_id}")
     
     def get_summary(self, user_id: int) -> str:
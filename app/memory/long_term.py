@@ -1,20 +1,134 @@
 """Long-term memory management with vector storage."""
-import json
+import asyncio
+import functools
 import logging
 import os
+import time
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
-import chromadb
-from chromadb.config import Settings
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from app.memory._numpy_store import NumpyClient
 from app.storage.db import db
 from app.utils.tokens import count_tokens, split_into_chunks
 
 logger = logging.getLogger(__name__)
 
+# Micro-batching window for single-message embeds: wait briefly for more
+# requests so one padded batched forward replaces N single forwards
+_EMBED_BATCH_MAX = 64
+_EMBED_BATCH_WAIT = 0.025  # seconds
+
+# ONNX Runtime is ~2-3x faster than the PyTorch backend on CPU, and the
+# INT8-quantized export roughly doubles that again on AVX-512 VNNI chips
+_EMBED_BACKEND = os.getenv("EMBED_BACKEND", "onnx")
+_EMBED_ONNX_FILE = os.getenv("EMBED_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+
+# On a GPU the torch backend in FP16 halves memory bandwidth and doubles
+# tensor-core throughput; the int8 ONNX path is CPU-oriented
+
+
+@functools.lru_cache(maxsize=1)
+def _embed_device() -> str:
+    """Pick the embedding device, without importing torch at module load.
+
+    torch is only needed for the CUDA probe; ONNX-backed CPU deployments
+    may not ship it at all, so treat a missing torch as CPU.
+    """
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+@functools.lru_cache(maxsize=1)
+def _file_embed_batch() -> int:
+    """Encode batch size for bulk file ingest.
+
+    GPUs amortize launch overhead over much larger batches than CPU
+    cores do; derived lazily because it depends on the device probe.
+    """
+    return int(
+        os.getenv("EMBED_BATCH_SIZE", "128" if _embed_device() == "cuda" else "32")
+    )
+
+# Two-stage retrieval: a reduced-dimension shortlist index feeds a
+# full-vector exact rerank. 256 of the model's 384 dims keeps ~95% of
+# MiniLM's retrieval quality at 2/3 the index size and traversal cost
+_SHORTLIST_DIM = int(os.getenv("SHORTLIST_DIM", "256"))
+_SHORTLIST_TOP = int(os.getenv("SHORTLIST_TOP", "200"))
+
+# Optional Model2Vec static model (e.g. "minishlab/potion-base-8M") for
+# chat-message writes: ~100x faster than a transformer forward at ~90%
+# of the quality, which is a fine trade for low-value message recall.
+# File chunks always use the full transformer.
+_EMBED_STATIC_MODEL = os.getenv("EMBED_STATIC_MODEL", "")
+
+@functools.lru_cache(maxsize=1)
+def _load_embeddings_model() -> SentenceTransformer:
+    """Load the embedding model, preferring the quantized ONNX backend.
+
+    Cached so repeated LongTermMemory construction (tests, reloads)
+    reuses the one loaded model instead of paying the multi-second
+    load again. Falls back to the default PyTorch backend when the
+    requested backend or quantized export is unavailable on this host.
+    On CUDA the torch backend is used directly in FP16.
+    """
+    device = _embed_device()
+    if _EMBED_BACKEND != "torch" and device == "cpu":
+        try:
+            return SentenceTransformer(
+                'all-MiniLM-L6-v2',
+                backend=_EMBED_BACKEND,
+                model_kwargs={"file_name": _EMBED_ONNX_FILE}
+            )
+        except Exception as e:
+            logger.warning(f"Embedding backend '{_EMBED_BACKEND}' unavailable, "
+                           f"falling back to torch: {e}")
+
+    model = SentenceTransformer('all-MiniLM-L6-v2', device=device)
+    if device == "cuda":
+        model.half()
+    return model
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_query_embedding(model: SentenceTransformer, query_norm: str) -> tuple:
+    """Encode a whitespace-normalized query, memoizing repeat queries.
+
+    Retries and follow-ups re-issue the same short queries constantly,
+    so cache hits skip the transformer forward entirely. Returned as a
+    tuple so the cached value is immutable and hashable.
+    """
+    return tuple(model.encode([query_norm], normalize_embeddings=True)[0].tolist())
+
+
+def _load_message_model(default: SentenceTransformer) -> SentenceTransformer:
+    """Load the (optional) static model used for chat-message embeds."""
+    if not _EMBED_STATIC_MODEL:
+        return default
+    try:
+        return SentenceTransformer.from_model2vec(_EMBED_STATIC_MODEL)
+    except Exception as e:
+        logger.warning(f"Static embedding model '{_EMBED_STATIC_MODEL}' "
+                       f"unavailable, using transformer: {e}")
+        return default
+
+
+def _shortlist_vectors(embeddings: np.ndarray) -> np.ndarray:
+    """Truncate embeddings to the shortlist dimension and renormalize.
+
+    Renormalizing keeps inner-product distance equivalent to cosine in
+    the reduced space, matching the full collection's scoring.
+    """
+    head = np.ascontiguousarray(embeddings[:, :_SHORTLIST_DIM], dtype=np.float32)
+    norms = np.linalg.norm(head, axis=1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    return head / norms
+
 
 @dataclass
 class MemorySummary:
@@ -25,67 +139,263 @@ class MemorySummary:
     meta: Dict[str, Any]
 
 
+class _EmbedQueue:
+    """Coalesces single-text embed requests into batched encode calls.
+
+    Per-call fixed overhead dominates transformer encodes of short chat
+    messages, so pending requests are collected for up to
+    ``_EMBED_BATCH_WAIT`` (or ``_EMBED_BATCH_MAX`` items) and encoded in
+    one call, with each caller awaiting its own future.
+    """
+
+    def __init__(self, model: SentenceTransformer):
+        self._model = model
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str):
+        """Embed one text, coalescing with concurrent requests."""
+        loop = asyncio.get_running_loop()
+        if self._consumer is None or self._consumer.done():
+            self._consumer = loop.create_task(self._consume())
+
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _consume(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + _EMBED_BATCH_WAIT
+            while len(batch) < _EMBED_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await asyncio.to_thread(
+                    self._model.encode,
+                    texts,
+                    batch_size=_EMBED_BATCH_MAX,
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
 class LongTermMemory:
     """Manages long-term memory with vector storage."""
     
-    def __init__(self, persist_dir: str = "./storage/chroma"):
-        """Initialize long-term memory."""
+    def __init__(self, persist_dir: Optional[str] = "./storage/chroma"):
+        """Initialize long-term memory.
+
+        ``persist_dir=None`` selects an in-process NumPy store with no
+        on-disk state, which tests use to skip both file creation and
+        the Chroma import entirely.
+        """
         self.persist_dir = persist_dir
-        self.embeddings_model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # Initialize ChromaDB
-        os.makedirs(persist_dir, exist_ok=True)
-        
-        self.client = chromadb.PersistentClient(
-            path=persist_dir,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        self.embeddings_model = _load_embeddings_model()
+
+        # Chroma is imported only when a persistent store is requested,
+        # so non-persistent runs (tests) never pay its import cost
+        if persist_dir is None:
+            self.client = NumpyClient()
+        else:
+            import chromadb
+            from chromadb.config import Settings
+
+            os.makedirs(persist_dir, exist_ok=True)
+            self.client = chromadb.PersistentClient(
+                path=persist_dir,
+                settings=Settings(anonymized_telemetry=False)
+            )
         
-        # Get or create collections
-        self.messages_collection = self.client.get_or_create_collection(
-            name="messages",
-            metadata={"hnsw:space": "cosine"}
+        # One unified collection for messages and file chunks, with the
+        # record type carried in metadata. A single larger HNSW graph is
+        # cheaper to search than two small ones (one entry-point descent,
+        # one candidate heap, one Python<->C++ crossing per query).
+        # Vectors are L2-normalized at write time, so inner-product
+        # distance ranks identically to cosine at fewer FLOPs.
+        self.memory_collection = self.client.get_or_create_collection(
+            name="memory",
+            metadata={
+                "hnsw:space": "ip",
+                "hnsw:M": int(os.getenv("HNSW_M", "24")),
+                "hnsw:construction_ef": int(os.getenv("HNSW_CONSTRUCTION_EF", "200")),
+                "hnsw:search_ef": int(os.getenv("HNSW_SEARCH_EF", "96"))
+            }
         )
-        
-        self.files_collection = self.client.get_or_create_collection(
-            name="files",
-            metadata={"hnsw:space": "cosine"}
+
+        # Reduced-dimension shortlist index for first-pass retrieval.
+        # Chroma stores float32 only, so the memory and traversal win
+        # comes from the smaller dimension; the exact ranking is
+        # recovered by reranking shortlisted candidates against the
+        # full vectors kept in the collection above.
+        self.shortlist_collection = self.client.get_or_create_collection(
+            name="memory_shortlist",
+            metadata={
+                "hnsw:space": "ip",
+                "hnsw:M": int(os.getenv("HNSW_M", "24")),
+                "hnsw:construction_ef": int(os.getenv("HNSW_CONSTRUCTION_EF", "200")),
+                "hnsw:search_ef": int(os.getenv("HNSW_SEARCH_EF", "96"))
+            }
         )
-    
-    def add_message(self, user_id: int, content: str, 
-                    message_id: str, metadata: Optional[Dict] = None) -> None:
+
+        # Shared micro-batcher so concurrent message writes coalesce into
+        # one batched encode instead of one forward pass each. Messages
+        # embed with the (optionally static) message model, which must
+        # produce vectors compatible with the unified collection.
+        self.message_model = _load_message_model(self.embeddings_model)
+        if (self.message_model is not self.embeddings_model
+                and self.message_model.get_sentence_embedding_dimension()
+                != self.embeddings_model.get_sentence_embedding_dimension()):
+            logger.warning("Static message model dimensionality does not match "
+                           "the unified collection; using the transformer")
+            self.message_model = self.embeddings_model
+        self._embed_queue = _EmbedQueue(self.message_model)
+
+        # Optional worker-process pool for bulk encodes: the GIL stops a
+        # single in-process model from overlapping encodes across users,
+        # so large file ingests can fan out across EMBED_PROCESSES cores
+        self._process_pool = None
+        workers = int(os.getenv("EMBED_PROCESSES", "0"))
+        if workers > 0:
+            self._process_pool = self.embeddings_model.start_multi_process_pool(
+                ["cpu"] * workers
+            )
+
+    async def add_message(self, user_id: int, content: str,
+                          message_id: str, metadata: Optional[Dict] = None) -> None:
         """Add a message to long-term memory."""
-        embedding = self.embeddings_model.encode([content])[0].tolist()
+        # Keep the embedding as float32 NumPy — Chroma accepts arrays
+        # directly, and .tolist() would allocate 384 Python floats per add
+        embedding = np.asarray(await self._embed_queue.embed(content), dtype=np.float32)
         
         doc_id = f"{user_id}_{message_id}"
         meta = {
             "user_id": user_id,
             "type": "message",
-            "created_at": datetime.now().isoformat(),
+            "created_at": int(time.time()),
             **(metadata or {})
         }
         
-        self.messages_collection.add(
+        self.memory_collection.add(
             embeddings=[embedding],
             documents=[content],
             metadatas=[meta],
             ids=[doc_id]
         )
-        
+        self.shortlist_collection.add(
+            embeddings=_shortlist_vectors(embedding[np.newaxis, :]),
+            metadatas=[meta],
+            ids=[doc_id]
+        )
+        db.add_user_doc_ids(user_id, "messages", [doc_id])
+
         logger.debug(f"Added message to long-term memory: {doc_id}")
     
+    async def add_messages_bulk(self, user_id: int,
+                                items: List[Tuple[str, str]],
+                                metadata: Optional[Dict] = None) -> None:
+        """Add many (message_id, content) messages in one batch.
+
+        One batched encode and one collection write replace a forward
+        pass and an HNSW insert per message, which is the dominant cost
+        when importing a backlog of history.
+        """
+        if not items:
+            return
+
+        contents = [content for _, content in items]
+        embeddings = await asyncio.to_thread(
+            self.message_model.encode,
+            contents,
+            batch_size=_EMBED_BATCH_MAX,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+        created_at = int(time.time())
+        ids = [f"{user_id}_{message_id}" for message_id, _ in items]
+        metadatas = [
+            {
+                "user_id": user_id,
+                "type": "message",
+                "created_at": created_at,
+                **(metadata or {})
+            }
+            for _ in items
+        ]
+
+        embeddings = embeddings.astype(np.float32, copy=False)
+        self.memory_collection.add(
+            embeddings=embeddings,
+            documents=contents,
+            metadatas=metadatas,
+            ids=ids
+        )
+        self.shortlist_collection.add(
+            embeddings=_shortlist_vectors(embeddings),
+            metadatas=metadatas,
+            ids=ids
+        )
+        db.add_user_doc_ids(user_id, "messages", ids)
+
+        logger.debug(f"Added {len(ids)} messages to long-term memory")
+
     def add_file_chunks(self, user_id: int, file_id: str, chunks: List[str],
                        file_name: str, metadata: Optional[Dict] = None) -> None:
         """Add file chunks to long-term memory."""
         if not chunks:
             return
-        
-        embeddings = self.embeddings_model.encode(chunks)
+
+        # Smart batching: encode in length order so each mini-batch pads
+        # to similar lengths, then scatter back to insertion order
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        sorted_chunks = [chunks[i] for i in order]
+
+        if self._process_pool is not None:
+            sorted_embeddings = self.embeddings_model.encode_multi_process(
+                sorted_chunks,
+                self._process_pool,
+                batch_size=_file_embed_batch(),
+                normalize_embeddings=True
+            )
+        else:
+            sorted_embeddings = self.embeddings_model.encode(
+                sorted_chunks,
+                batch_size=_file_embed_batch(),
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
         
         ids = []
         documents = []
         metadatas = []
-        
+
+        # One timestamp for the whole batch — epoch seconds are cheaper
+        # to produce and ~4x smaller in the metadata store than ISO text
+        created_at = int(time.time())
+
         for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
             doc_id = f"{user_id}_{file_id}_{i}"
             meta = {
@@ -94,7 +404,7 @@ class LongTermMemory:
                 "chunk_id": i,
                 "type": "file_chunk",
                 "file_name": file_name,
-                "created_at": datetime.now().isoformat(),
+                "created_at": created_at,
                 **(metadata or {})
             }
             
@@ -102,140 +412,141 @@ class LongTermMemory:
             documents.append(chunk)
             metadatas.append(meta)
         
-        self.files_collection.add(
-            embeddings=embeddings.tolist(),
+        embeddings = embeddings.astype(np.float32)
+        self.memory_collection.add(
+            embeddings=embeddings,
             documents=documents,
             metadatas=metadatas,
             ids=ids
         )
-        
+        self.shortlist_collection.add(
+            embeddings=_shortlist_vectors(embeddings),
+            metadatas=metadatas,
+            ids=ids
+        )
+        db.add_user_doc_ids(user_id, "files", ids)
+
         logger.info(f"Added {len(chunks)} chunks for file {file_id}")
     
     def search(self, user_id: int, query: str, top_k: int = 6) -> List[MemorySummary]:
-        """Search long-term memory for relevant content."""
-        query_embedding = self.embeddings_model.encode([query])[0].tolist()
-        
-        # Search messages
-        message_results = self.messages_collection.query(
-            query_embeddings=[query_embedding],
-            where={"user_id": user_id},
-            n_results=top_k // 2
+        """Search long-term memory with a shortlist pass and exact rerank.
+
+        The first pass traverses the reduced-dimension index, which is
+        2/3 smaller and correspondingly cheaper per hop; the shortlisted
+        candidates are then scored exactly against the full query vector
+        with one matrix-vector product.
+        """
+        query_norm = " ".join(query.lower().split())
+        q_full = np.asarray(
+            _cached_query_embedding(self.embeddings_model, query_norm),
+            dtype=np.float32
         )
-        
-        # Search files
-        file_results = self.files_collection.query(
-            query_embeddings=[query_embedding],
+
+        shortlist = self.shortlist_collection.query(
+            query_embeddings=_shortlist_vectors(q_full[np.newaxis, :]),
             where={"user_id": user_id},
-            n_results=top_k // 2
+            n_results=_SHORTLIST_TOP,
+            include=[]
         )
-        
-        summaries = []
-        
-        # Process message results
-        if message_results['documents']:
-            for doc, meta, score in zip(
-                message_results['documents'][0],
-                message_results['metadatas'][0],
-                message_results['distances'][0]
-            ):
-                summaries.append(MemorySummary(
-                    source="vector",
-                    text=doc,
-                    score=1.0 - score,  # Convert distance to similarity
-                    meta=meta
-                ))
-        
-        # Process file results
-        if file_results['documents']:
-            for doc, meta, score in zip(
-                file_results['documents'][0],
-                file_results['metadatas'][0],
-                file_results['distances'][0]
-            ):
-                summaries.append(MemorySummary(
-                    source="vector",
-                    text=doc,
-                    score=1.0 - score,
-                    meta=meta
-                ))
-        
-        # Sort by score and return top-k
-        summaries.sort(key=lambda x: x.score, reverse=True)
-        return summaries[:top_k]
+        candidate_ids = shortlist['ids'][0] if shortlist['ids'] else []
+        if not candidate_ids:
+            return []
+
+        candidates = self.memory_collection.get(
+            ids=candidate_ids,
+            include=["embeddings", "documents", "metadatas"]
+        )
+        vectors = np.asarray(candidates['embeddings'], dtype=np.float32)
+        # Both sides are unit-norm, so the inner product is the cosine
+        scores = vectors @ q_full
+
+        order = np.argsort(-scores)[:top_k]
+        return [
+            MemorySummary(
+                source="vector",
+                text=candidates['documents'][i],
+                score=float(scores[i]),
+                meta=candidates['metadatas'][i]
+            )
+            for i in order
+        ]
     
     def get_user_memories(self, user_id: int, limit: int = 100) -> List[MemorySummary]:
         """Get all memories for a user."""
-        # Get messages
-        message_results = self.messages_collection.get(
+        results = self.memory_collection.get(
             where={"user_id": user_id},
-            limit=limit // 2
+            limit=limit
         )
-        
-        # Get file chunks
-        file_results = self.files_collection.get(
-            where={"user_id": user_id},
-            limit=limit // 2
-        )
-        
+
         summaries = []
-        
-        # Process messages
-        for doc, meta in zip(message_results['documents'], message_results['metadatas']):
-            summaries.append(MemorySummary(
-                source="vector",
-                text=doc,
-                score=1.0,
-                meta=meta
-            ))
-        
-        # Process files
-        for doc, meta in zip(file_results['documents'], file_results['metadatas']):
+        for doc, meta in zip(results['documents'], results['metadatas']):
             summaries.append(MemorySummary(
                 source="vector",
                 text=doc,
                 score=1.0,
                 meta=meta
             ))
-        
+
         return summaries
     
     def delete_user_memories(self, user_id: int) -> None:
         """Delete all memories for a user."""
-        # Delete from messages collection
-        message_results = self.messages_collection.get(
-            where={"user_id": user_id}
-        )
-        if message_results['ids']:
-            self.messages_collection.delete(ids=message_results['ids'])
-        
-        # Delete from files collection
-        file_results = self.files_collection.get(
-            where={"user_id": user_id}
-        )
-        if file_results['ids']:
-            self.files_collection.delete(ids=file_results['ids'])
-        
+        # Resolve the user's doc IDs from the indexed sidecar table
+        # instead of a linear metadata scan over the collection
+        doc_ids = (db.get_user_doc_ids(user_id, "messages")
+                   + db.get_user_doc_ids(user_id, "files"))
+
+        # Fall back to a metadata scan for records written before the
+        # sidecar index existed
+        if not doc_ids:
+            doc_ids = self.memory_collection.get(
+                where={"user_id": user_id}
+            )['ids']
+
+        if doc_ids:
+            self.memory_collection.delete(ids=doc_ids)
+            self.shortlist_collection.delete(ids=doc_ids)
+        db.delete_user_doc_ids(user_id)
+
+        # Best-effort wipe of the legacy per-type collections: vectors
+        # written before the unified collection existed live there and
+        # must not survive a user wipe. get_collection (not create) so
+        # fresh deployments skip this without creating empty ones.
+        for legacy_name in ("messages", "files"):
+            try:
+                self.client.get_collection(legacy_name).delete(
+                    where={"user_id": user_id}
+                )
+            except Exception:
+                # Collection absent (fresh deployment or NumPy backend)
+                continue
+
         logger.info(f"Deleted all long-term memories for user {user_id}")
-    
+
     def get_stats(self, user_id: int) -> Dict[str, int]:
         """Get memory statistics."""
         try:
-            message_count = len(self.messages_collection.get(
-                where={"user_id": user_id}
-            )['ids'])
-            
-            file_count = len(self.files_collection.get(
-                where={"user_id": user_id}
-            )['ids'])
-            
+            # Two indexed COUNT lookups instead of collection scans
             return {
-                "message_memories": message_count,
-                "file_chunks": file_count
+                "message_memories": db.count_user_docs(user_id, "messages"),
+                "file_chunks": db.count_user_docs(user_id, "files")
             }
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
             return {"message_memories": 0, "file_chunks": 0}
 
 
-# Global instance
-long_memory = LongTermMemory()
\ No newline at end of file
+# Global instance, constructed lazily on first attribute access so that
+# importing this module (e.g. from conftest during test collection)
+# doesn't load the embedding model or create ./storage/chroma
+_long_memory: Optional[LongTermMemory] = None
+
+
+def __getattr__(name: str):
+    """Lazily construct the module-level memory singleton."""
+    if name == "long_memory":
+        global _long_memory
+        if _long_memory is None:
+            _long_memory = LongTermMemory()
+        return _long_memory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,10 +1,11 @@
 """Short-term memory management with sliding window."""
 import logging
+from collections import deque
 from datetime import datetime
-from typing import List, Optional
+from typing import Deque, List, Optional, Tuple
 
 from app.storage.db import ChatMessage, db
-from app.utils.tokens import count_tokens
+from app.utils.tokens import count_tokens, count_tokens_batch
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +27,12 @@ class ShortTermMemory:
     def add_message(self, user_id: int, role: str, content: str, 
                     message_id: Optional[str] = None) -> ChatMessage:
         """Add a message to short-term memory."""
+        # One clock read per message: the id and created_at otherwise
+        # carry two slightly different timestamps
+        now = datetime.now()
         if message_id is None:
-            message_id = f"{user_id}_{datetime.now().isoformat()}"
-        
+            message_id = f"{user_id}_{now.isoformat()}"
+
         tokens = count_tokens(content)
         message = ChatMessage(
             id=message_id,
@@ -36,20 +40,55 @@ class ShortTermMemory:
             role=role,
             content=content,
             tokens=tokens,
-            created_at=datetime.now()
+            created_at=now
         )
         
         db.save_message(message)
         logger.debug(f"Added message to short-term memory: {message_id}")
         return message
-    
-    def get_recent_messages(self, user_id: int, limit: Optional[int] = None) -> List[ChatMessage]:
-        """Get recent messages for a user."""
+
+    def bulk_add(self, user_id: int, items: List[Tuple[str, str]]) -> List[ChatMessage]:
+        """Add many (role, content) messages in one batch.
+
+        Tokenizes all contents with a single batched encode and saves
+        the rows in one transaction, instead of one encode and one
+        write per message.
+        """
+        if not items:
+            return []
+
+        now = datetime.now()
+        token_counts = count_tokens_batch([content for _, content in items])
+
+        messages = [
+            ChatMessage(
+                id=f"{user_id}_{now.isoformat()}_{i}",
+                user_id=user_id,
+                role=role,
+                content=content,
+                tokens=tokens,
+                created_at=now
+            )
+            for i, ((role, content), tokens) in enumerate(zip(items, token_counts))
+        ]
+
+        db.save_messages(messages)
+        logger.debug(f"Added {len(messages)} messages to short-term memory")
+        return messages
+
+    def get_recent_messages(self, user_id: int, limit: Optional[int] = None) -> Deque[ChatMessage]:
+        """Get recent messages for a user in chronological order.
+
+        Returns a deque (iterable, sized) built in one pass via
+        appendleft, avoiding the extra list the old reversed() copy
+        allocated. Callers that need a real list can wrap in list().
+        """
         limit = limit or self.max_messages
-        messages = db.get_recent_messages(user_id, limit=limit)
-        
-        # Return in chronological order (oldest first)
-        return list(reversed(messages))
+
+        messages: Deque[ChatMessage] = deque()
+        for message in db.get_recent_messages(user_id, limit=limit):
+            messages.appendleft(message)
+        return messages
     
     def get_context_messages(self, user_id: int) -> List[ChatMessage]:
         """Get messages for AI context, respecting token budget."""
@@ -57,8 +96,8 @@ class ShortTermMemory:
         
         # Ensure we have at least some context
         if not messages:
-            messages = self.get_recent_messages(user_id, limit=10)
-        
+            messages = list(self.get_recent_messages(user_id, limit=10))
+
         return messages
     
     def forget_last(self, user_id: int, count: int = 10) -> int:
@@ -74,11 +113,12 @@ class ShortTermMemory:
     
     def get_stats(self, user_id: int) -> dict:
         """Get memory statistics."""
-        messages = self.get_recent_messages(user_id)
-        total_tokens = sum(msg.tokens for msg in messages)
-        
+        # COUNT/SUM in SQL instead of materializing the message window
+        window = db.get_recent_message_stats(user_id, limit=self.max_messages)
+        total_tokens = window["total_tokens"]
+
         return {
-            "message_count": len(messages),
+            "message_count": window["message_count"],
             "total_tokens": total_tokens,
             "max_messages": self.max_messages,
             "token_budget": self.token_budget,
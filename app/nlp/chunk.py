@@ -2,6 +2,8 @@
 import logging
 from typing import List
 
+import numpy as np
+
 from app.utils.tokens import count_tokens, split_into_chunks
 
 logger = logging.getLogger(__name__)
@@ -38,30 +40,34 @@ class TextChunker:
     def chunk_with_context(self, text: str, context_size: int = 200) -> List[dict]:
         """Chunk text with surrounding context."""
         chunks = self.chunk_text(text)
-        
+        if not chunks:
+            return []
+
+        # Split each chunk once into one flat word array with cumulative
+        # boundary offsets; context windows are then plain array slices
+        # instead of per-neighbor re-splits and list copies
+        word_lists = [chunk.split() for chunk in chunks]
+        bounds = np.zeros(len(word_lists) + 1, dtype=np.int64)
+        np.cumsum([len(words) for words in word_lists], out=bounds[1:])
+        all_words = np.array(
+            [word for words in word_lists for word in words], dtype=object
+        )
+
+        half = context_size // 2
         result = []
         for i, chunk in enumerate(chunks):
-            # Get context from previous chunks
-            start_context = ""
-            if i > 0:
-                prev_chunk = chunks[i-1]
-                tokens = prev_chunk.split()
-                start_context = " ".join(tokens[-context_size//2:])
-            
-            # Get context from next chunks
-            end_context = ""
-            if i < len(chunks) - 1:
-                next_chunk = chunks[i+1]
-                tokens = next_chunk.split()
-                end_context = " ".join(tokens[:context_size//2])
-            
+            start = bounds[i]
+            end = bounds[i + 1]
+            start_context = " ".join(all_words[max(0, start - half):start])
+            end_context = " ".join(all_words[end:end + half])
+
             result.append({
                 "chunk": chunk,
                 "context": f"{start_context} ... {end_context}".strip(),
                 "chunk_id": i,
                 "tokens": count_tokens(chunk)
             })
-        
+
         return result
 
 
@@ -1,4 +1,5 @@
 """Command router for handling Telegram commands."""
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -21,6 +22,21 @@ class CommandRouter:
     def __init__(self):
         """Initialize command router."""
         self.owner_id = int(os.getenv("OWNER_USER_ID", 0))
+
+        # O(1) dispatch table instead of walking an if/elif chain
+        self._handlers = {
+            "/start": self._handle_start,
+            "/help": self._handle_help,
+            "/memory": self._handle_memory,
+            "/forget": self._handle_forget,
+            "/forget_all": self._handle_forget_all,
+            "/wipe_me": self._handle_wipe_me,
+            "/export": self._handle_export,
+            "/mode": self._handle_mode,
+            "/stats": self._handle_stats,
+            "/privacy": self._handle_privacy,
+            "/admin": self._handle_admin,
+        }
     
     async def handle_command(self, event, client: TelegramClient):
         """Handle incoming commands."""
@@ -34,32 +50,13 @@ class CommandRouter:
         args = parts[1:]
         
         # Route command
-        if command == "/start":
-            await self._handle_start(event)
-        elif command == "/help":
-            await self._handle_help(event)
-        elif command == "/memory":
-            await self._handle_memory(event, user_id)
-        elif command == "/forget":
-            await self._handle_forget(event, user_id, args)
-        elif command == "/forget_all":
-            await self._handle_forget_all(event, user_id)
-        elif command == "/wipe_me":
-            await self._handle_wipe_me(event, user_id)
-        elif command == "/export":
-            await self._handle_export(event, user_id)
-        elif command == "/mode":
-            await self._handle_mode(event, user_id, args)
-        elif command == "/stats":
-            await self._handle_stats(event, user_id)
-        elif command == "/privacy":
-            await self._handle_privacy(event)
-        elif command == "/admin" and user_id == self.owner_id:
-            await self._handle_admin(event)
-        else:
+        handler = self._handlers.get(command)
+        if handler is None:
             await event.reply("Unknown command. Type /help for available commands.")
+            return
+        await handler(event, user_id, args)
     
-    async def _handle_start(self, event):
+    async def _handle_start(self, event, user_id: int, args: list):
         """Handle /start command with professional UI."""
         welcome_text = """🤖 **Welcome to Your AI Assistant**
 
@@ -86,7 +83,7 @@ I'm your intelligent companion with advanced memory capabilities.
         
         await event.reply(welcome_text)
     
-    async def _handle_help(self, event):
+    async def _handle_help(self, event, user_id: int, args: list):
         """Handle /help command with professional formatting."""
         help_text = """📖 **Complete Command Guide**
 
@@ -125,12 +122,15 @@ Simply upload any file (PDF, DOCX, TXT, MD) for AI analysis
         
         await event.reply(help_text)
     
-    async def _handle_memory(self, event, user_id: int):
+    async def _handle_memory(self, event, user_id: int, args: list):
         """Handle /memory command with professional dashboard."""
-        # Get all memory stats
-        short_stats = short_memory.get_stats(user_id)
-        long_stats = long_memory.get_stats(user_id)
-        facts = facts_store.get_facts(user_id, limit=10)
+        # Fetch all memory stats concurrently — each call is independent
+        # SQLite/ChromaDB I/O, so threads overlap the round-trips
+        short_stats, long_stats, facts = await asyncio.gather(
+            asyncio.to_thread(short_memory.get_stats, user_id),
+            asyncio.to_thread(long_memory.get_stats, user_id),
+            asyncio.to_thread(facts_store.get_facts, user_id, 10)
+        )
         
         response = """🧠 **Memory Dashboard**
 
@@ -163,21 +163,24 @@ Simply upload any file (PDF, DOCX, TXT, MD) for AI analysis
         
         await event.reply(f"🗑️ Forgot {deleted} recent messages.")
     
-    async def _handle_forget_all(self, event, user_id: int):
+    async def _handle_forget_all(self, event, user_id: int, args: list):
         """Handle /forget_all command."""
         short_memory.forget_all(user_id)
         await event.reply("🗑️ Cleared all short-term memory.")
     
-    async def _handle_wipe_me(self, event, user_id: int):
+    async def _handle_wipe_me(self, event, user_id: int, args: list):
         """Handle /wipe_me command."""
-        # Delete all user data
+        # Delete all user data. The facts store is told explicitly so
+        # its read caches (and the prompt-context cache) drop the user
+        # along with the rows.
         db.delete_all_user_data(user_id)
+        facts_store.delete_user_facts(user_id)
         long_memory.delete_user_memories(user_id)
         file_processor.delete_user_files(user_id)
         
         await event.reply("🗑️ All your data has been permanently deleted.")
     
-    async def _handle_export(self, event, user_id: int):
+    async def _handle_export(self, event, user_id: int, args: list):
         """Handle /export command."""
         # Get user data
         stats = db.get_stats(user_id)
@@ -195,9 +198,11 @@ Simply upload any file (PDF, DOCX, TXT, MD) for AI analysis
                      for f in files]
         }
         
-        # Send as JSON
-        import json
-        export_text = json.dumps(export_data, indent=2, default=str)
+        # Send as JSON — orjson serializes the export in one C pass
+        import orjson
+        export_text = orjson.dumps(
+            export_data, option=orjson.OPT_INDENT_2, default=str
+        ).decode()
         
         if len(export_text) > 4000:
             # Send as file if too large
@@ -224,12 +229,14 @@ Simply upload any file (PDF, DOCX, TXT, MD) for AI analysis
         else:
             await event.reply(f"❌ Invalid mode. Use: {', '.join(valid_modes)}")
     
-    async def _handle_stats(self, event, user_id: int):
+    async def _handle_stats(self, event, user_id: int, args: list):
         """Handle /stats command with professional analytics."""
-        db_stats = db.get_stats(user_id)
-        file_stats = file_processor.get_file_stats(user_id)
-        short_stats = short_memory.get_stats(user_id)
-        long_stats = long_memory.get_stats(user_id)
+        db_stats, file_stats, short_stats, long_stats = await asyncio.gather(
+            asyncio.to_thread(db.get_stats, user_id),
+            asyncio.to_thread(file_processor.get_file_stats, user_id),
+            asyncio.to_thread(short_memory.get_stats, user_id),
+            asyncio.to_thread(long_memory.get_stats, user_id)
+        )
         
         response = """📊 **Analytics Dashboard**
 
@@ -262,7 +269,7 @@ Simply upload any file (PDF, DOCX, TXT, MD) for AI analysis
         
         await event.reply(response)
     
-    async def _handle_privacy(self, event):
+    async def _handle_privacy(self, event, user_id: int, args: list):
         """Handle /privacy command with professional policy."""
         privacy_text = """🔒 **Privacy & Data Protection**
 
@@ -292,8 +299,12 @@ Simply upload any file (PDF, DOCX, TXT, MD) for AI analysis
         
         await event.reply(privacy_text)
     
-    async def _handle_admin(self, event):
+    async def _handle_admin(self, event, user_id: int, args: list):
         """Handle /admin command for owner."""
+        if user_id != self.owner_id:
+            await event.reply("Unknown command. Type /help for available commands.")
+            return
+
         # Get global stats
         from app.storage.db import db
         
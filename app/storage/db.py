@@ -1,7 +1,11 @@
 """Database models and connection management."""
 import asyncio
-import json
+import atexit
+import os
+import queue
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -10,6 +14,125 @@ from typing import Any, Dict, List, Optional, Union
 
 from app.utils.tokens import count_tokens
 
+# Per-connection PRAGMAs (journal_mode=WAL persists in the database file
+# and is set once at init; these must be applied on every connection).
+# mmap_size is filled in from SQLITE_MMAP_MB
+_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size={mmap_size};
+    PRAGMA cache_size=-64000;
+    PRAGMA busy_timeout=5000;
+"""
+
+# Hot-path SQL hoisted to module constants: sqlite3's per-connection
+# statement cache is keyed by string identity, so a constant guarantees
+# the prepared statement is reused instead of reparsed
+_SQL_UPSERT_USER = """
+    INSERT OR REPLACE INTO users (id, username, first_seen, last_seen, locale)
+    VALUES (?, COALESCE(?, (SELECT username FROM users WHERE id = ?)),
+            COALESCE((SELECT first_seen FROM users WHERE id = ?), ?), ?, ?)
+"""
+
+_SQL_INSERT_MESSAGE = """
+    INSERT OR IGNORE INTO messages (id, user_id, role, content, tokens, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_RECENT_MESSAGES = """
+    SELECT * FROM messages
+    WHERE user_id = ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+_SQL_MESSAGES_BY_TOKENS = """
+    SELECT id, user_id, role, content, tokens, created_at FROM (
+        SELECT *, SUM(tokens) OVER (ORDER BY created_at DESC) AS csum
+        FROM messages
+        WHERE user_id = ?
+    )
+    WHERE csum <= ?
+    ORDER BY created_at ASC
+"""
+
+_SQL_INSERT_FACT = """
+    INSERT OR REPLACE INTO facts (user_id, key, value, confidence, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_FACTS = """
+    SELECT * FROM facts
+    WHERE user_id = ?
+    ORDER BY confidence DESC, updated_at DESC
+    LIMIT ?
+"""
+
+_SQL_INSERT_FILE = """
+    INSERT OR IGNORE INTO files (id, user_id, tg_file_id, mime, name, path, size, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Timestamp columns that predate the unix-ms switch. Databases created
+# before it declared these TEXT, so ISO-8601 rows and even new integer
+# binds are stored as text there; _migrate_legacy_timestamps rewrites
+# them to unix milliseconds so every value in a column sorts and parses
+# the same way (see init_tables)
+_LEGACY_TIMESTAMP_COLUMNS = (
+    ("users", "first_seen"),
+    ("users", "last_seen"),
+    ("messages", "created_at"),
+    ("facts", "updated_at"),
+    ("files", "created_at"),
+)
+
+# ISO text becomes unix ms (strftime with 'utc' reads the naive local
+# times the old code wrote; %f recovers the sub-second part); digit
+# strings — integer binds coerced by the old TEXT affinity — are cast
+# through unchanged
+_SQL_MIGRATE_TIMESTAMP = """
+    UPDATE {table} SET {column} =
+        CASE WHEN {column} NOT GLOB '*[^0-9]*'
+             THEN CAST({column} AS INTEGER)
+             ELSE CAST(strftime('%s', {column}, 'utc') AS INTEGER) * 1000
+                  + CAST(substr(strftime('%f', {column}), 4) AS INTEGER)
+        END
+    WHERE typeof({column}) = 'text'
+"""
+
+
+# Message write buffering: flush when this many rows are pending or the
+# window has lapsed since the last flush, whichever comes first
+_MESSAGE_FLUSH_MAX = 64
+_MESSAGE_FLUSH_INTERVAL = 0.05
+
+
+def _now_ms() -> int:
+    """Current time as unix milliseconds (the stored timestamp format)."""
+    return time.time_ns() // 1_000_000
+
+
+def _to_ms(dt: datetime) -> int:
+    """Convert a datetime to stored unix milliseconds."""
+    return int(dt.timestamp() * 1000)
+
+
+def _parse_timestamp(value) -> datetime:
+    """Parse a stored timestamp.
+
+    New rows store INTEGER unix milliseconds (fixed-width index
+    comparisons, no string parsing). Upgraded databases keep TEXT
+    affinity on the old columns, so the same milliseconds arrive as
+    digit strings there; ISO-8601 text is parsed as a last resort for
+    rows the init-time migration hasn't seen.
+    """
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000)
+    if value.isdigit():
+        # Unix ms kept as text by a legacy TEXT-affinity column
+        return datetime.fromtimestamp(int(value) / 1000)
+    return datetime.fromisoformat(value)
+
 
 @dataclass
 class ChatMessage:
@@ -22,15 +145,15 @@ class ChatMessage:
     created_at: datetime
     
     @classmethod
-    def from_row(cls, row: tuple) -> "ChatMessage":
+    def from_row(cls, row: sqlite3.Row) -> "ChatMessage":
         """Create ChatMessage from database row."""
         return cls(
-            id=row[0],
-            user_id=row[1],
-            role=row[2],
-            content=row[3],
-            tokens=row[4],
-            created_at=datetime.fromisoformat(row[5])
+            id=row["id"],
+            user_id=row["user_id"],
+            role=row["role"],
+            content=row["content"],
+            tokens=row["tokens"],
+            created_at=_parse_timestamp(row["created_at"])
         )
 
 
@@ -44,14 +167,14 @@ class User:
     locale: Optional[str]
     
     @classmethod
-    def from_row(cls, row: tuple) -> "User":
+    def from_row(cls, row: sqlite3.Row) -> "User":
         """Create User from database row."""
         return cls(
-            id=row[0],
-            username=row[1],
-            first_seen=datetime.fromisoformat(row[2]),
-            last_seen=datetime.fromisoformat(row[3]),
-            locale=row[4]
+            id=row["id"],
+            username=row["username"],
+            first_seen=_parse_timestamp(row["first_seen"]),
+            last_seen=_parse_timestamp(row["last_seen"]),
+            locale=row["locale"]
         )
 
 
@@ -66,15 +189,15 @@ class Fact:
     updated_at: datetime
     
     @classmethod
-    def from_row(cls, row: tuple) -> "Fact":
+    def from_row(cls, row: sqlite3.Row) -> "Fact":
         """Create Fact from database row."""
         return cls(
-            id=row[0],
-            user_id=row[1],
-            key=row[2],
-            value=row[3],
-            confidence=row[4],
-            updated_at=datetime.fromisoformat(row[5])
+            id=row["id"],
+            user_id=row["user_id"],
+            key=row["key"],
+            value=row["value"],
+            confidence=row["confidence"],
+            updated_at=_parse_timestamp(row["updated_at"])
         )
 
 
@@ -91,17 +214,17 @@ class FileRecord:
     created_at: datetime
     
     @classmethod
-    def from_row(cls, row: tuple) -> "FileRecord":
+    def from_row(cls, row: sqlite3.Row) -> "FileRecord":
         """Create FileRecord from database row."""
         return cls(
-            id=row[0],
-            user_id=row[1],
-            tg_file_id=row[2],
-            mime=row[3],
-            name=row[4],
-            path=row[5],
-            size=row[6],
-            created_at=datetime.fromisoformat(row[7])
+            id=row["id"],
+            user_id=row["user_id"],
+            tg_file_id=row["tg_file_id"],
+            mime=row["mime"],
+            name=row["name"],
+            path=row["path"],
+            size=row["size"],
+            created_at=_parse_timestamp(row["created_at"])
         )
 
 
@@ -109,20 +232,76 @@ class Database:
     """Database connection and operations."""
     
     def __init__(self, db_path: str = "storage/app.db"):
-        """Initialize database connection."""
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        """Initialize database connection.
+
+        Accepts a filesystem path, ":memory:" (tests) or a "file:" URI
+        (e.g. "file:app.db?mode=ro").
+        """
+        if db_path == ":memory:":
+            # Shared cache so every pooled connection sees the same
+            # in-memory database instead of its own empty one
+            db_path = "file::memory:?cache=shared"
+        self._uri = db_path.startswith("file:")
+        self.db_path: Union[str, Path] = db_path if self._uri else Path(db_path)
+        if not self._uri:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # mmap window for reads; tune down on small hosts or up for
+        # databases that outgrow the 256 MB default
+        self._mmap_size = int(os.getenv("SQLITE_MMAP_MB", 256)) * 1024 * 1024
+
+        # WAL lets readers and writers proceed concurrently and cuts
+        # fsync cost; the journal mode is persistent, so set it once
+        # (in-memory databases silently keep their own journal mode)
+        conn = sqlite3.connect(self.db_path, uri=self._uri)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+
+        # Bounded pool of pre-opened connections: each keeps its PRAGMA
+        # setup and warm page cache across calls instead of paying
+        # open/configure/close per operation
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(min(4, os.cpu_count() or 1)):
+            self._pool.put(self._new_connection())
+
+        # Whether this SQLite build supports DELETE ... ORDER BY ... LIMIT
+        # (SQLITE_ENABLE_UPDATE_DELETE_LIMIT); probed on first delete
+        self._delete_limit_supported = None
+
+        # Pending single-message writes, flushed as one executemany
+        # batch (see save_message)
+        self._message_buffer: List[ChatMessage] = []
+        self._message_buffer_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        # Safety net for exit paths that never run a client shutdown:
+        # whatever is still buffered goes out with the interpreter
+        atexit.register(self.flush_messages)
+
         self.init_tables()
-    
+
+    def _new_connection(self) -> sqlite3.Connection:
+        """Open and configure one pooled connection."""
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=256,
+            uri=self._uri
+        )
+        conn.executescript(_CONNECTION_PRAGMAS.format(mmap_size=self._mmap_size))
+        conn.row_factory = sqlite3.Row
+        return conn
+
     @contextmanager
     def get_connection(self):
-        """Get database connection with context manager."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Check a pooled database connection out for the duration."""
+        conn = self._pool.get()
         try:
             yield conn
         finally:
-            conn.close()
+            # Never return a connection mid-transaction to the pool
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
     
     def init_tables(self):
         """Initialize database tables."""
@@ -131,8 +310,8 @@ class Database:
                 CREATE TABLE IF NOT EXISTS users (
                     id INTEGER PRIMARY KEY,
                     username TEXT,
-                    first_seen TEXT NOT NULL,
-                    last_seen TEXT NOT NULL,
+                    first_seen INTEGER NOT NULL,
+                    last_seen INTEGER NOT NULL,
                     locale TEXT
                 );
                 
@@ -142,20 +321,25 @@ class Database:
                     role TEXT NOT NULL CHECK (role IN ('user', 'assistant', 'system')),
                     content TEXT NOT NULL,
                     tokens INTEGER NOT NULL,
-                    created_at TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
                     FOREIGN KEY (user_id) REFERENCES users (id)
                 );
                 
-                CREATE INDEX IF NOT EXISTS idx_messages_user_created 
-                ON messages(user_id, created_at);
-                
+                -- Covering index for the hot message reads: recent-window
+                -- and token-budget queries are satisfied entirely from the
+                -- index (newest-first, no table lookups per row). Replaces
+                -- the old two-column idx_messages_user_created.
+                DROP INDEX IF EXISTS idx_messages_user_created;
+                CREATE INDEX IF NOT EXISTS idx_messages_user_created_cov
+                ON messages(user_id, created_at DESC, tokens, role, content);
+
                 CREATE TABLE IF NOT EXISTS facts (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL,
                     key TEXT NOT NULL,
                     value TEXT NOT NULL,
                     confidence REAL NOT NULL,
-                    updated_at TEXT NOT NULL,
+                    updated_at INTEGER NOT NULL,
                     UNIQUE(user_id, key),
                     FOREIGN KEY (user_id) REFERENCES users (id)
                 );
@@ -171,7 +355,7 @@ class Database:
                     name TEXT NOT NULL,
                     path TEXT NOT NULL,
                     size INTEGER NOT NULL,
-                    created_at TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
                     FOREIGN KEY (user_id) REFERENCES users (id)
                 );
                 
@@ -182,32 +366,65 @@ class Database:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     file_id TEXT NOT NULL,
                     chunk_id INTEGER NOT NULL,
-                    vector TEXT NOT NULL,
+                    -- raw little-endian float32 (np.frombuffer/tobytes),
+                    -- not a JSON string of Python floats
+                    vector BLOB NOT NULL,
                     text TEXT NOT NULL,
                     meta TEXT,
                     FOREIGN KEY (file_id) REFERENCES files (id),
                     UNIQUE(file_id, chunk_id)
                 );
                 
-                CREATE INDEX IF NOT EXISTS idx_embeddings_file 
+                CREATE INDEX IF NOT EXISTS idx_embeddings_file
                 ON embeddings(file_id);
+
+                CREATE TABLE IF NOT EXISTS user_doc_ids (
+                    user_id INTEGER NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    collection TEXT NOT NULL,
+                    UNIQUE(collection, doc_id)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_user_doc_ids_user
+                ON user_doc_ids(user_id, collection);
             """)
+            self._migrate_legacy_timestamps(conn)
             conn.commit()
+
+    def _migrate_legacy_timestamps(self, conn: sqlite3.Connection) -> None:
+        """Rewrite pre-migration text timestamps as unix milliseconds.
+
+        Databases created before the unix-ms switch declared the
+        timestamp columns TEXT, which both preserved old ISO-8601 rows
+        and coerced new integer binds into digit strings — a mix that
+        neither sorts nor parses consistently. One pass per column
+        normalizes every text value to milliseconds. Columns declared
+        INTEGER come from the current schema and are skipped without
+        touching any rows, so a fresh database pays only the
+        table_info lookups at init.
+        """
+        for table, column in _LEGACY_TIMESTAMP_COLUMNS:
+            declared = {
+                row["name"]: row["type"]
+                for row in conn.execute(f"PRAGMA table_info({table})")
+            }
+            if declared.get(column, "").upper() != "TEXT":
+                continue
+            conn.execute(_SQL_MIGRATE_TIMESTAMP.format(table=table, column=column))
     
     def upsert_user(self, user_id: int, username: Optional[str] = None, 
                    locale: Optional[str] = None) -> User:
         """Insert or update user."""
-        now = datetime.now().isoformat()
-        
+        now = _now_ms()
+
         with self.get_connection() as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO users (id, username, first_seen, last_seen, locale)
-                VALUES (?, COALESCE(?, (SELECT username FROM users WHERE id = ?)), 
-                        COALESCE((SELECT first_seen FROM users WHERE id = ?), ?), ?, ?)
-            """, (user_id, username, user_id, user_id, now, now, locale))
+            conn.execute(_SQL_UPSERT_USER,
+                         (user_id, username, user_id, user_id, now, now, locale))
             conn.commit()
-            
-            return self.get_user(user_id)
+
+        # Read back outside the with block: get_user checks out its own
+        # connection, which would deadlock on a one-connection pool
+        return self.get_user(user_id)
     
     def get_user(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
@@ -219,50 +436,110 @@ class Database:
             return User.from_row(row) if row else None
     
     def save_message(self, message: ChatMessage) -> None:
-        """Save a chat message."""
+        """Save a chat message.
+
+        Writes are buffered and flushed as one batched transaction once
+        the buffer fills or the flush window lapses, so a user/assistant
+        message pair costs one commit fsync instead of two. Reads flush
+        first, so buffered messages are never invisible to queries.
+        """
+        with self._message_buffer_lock:
+            self._message_buffer.append(message)
+            due = (len(self._message_buffer) >= _MESSAGE_FLUSH_MAX
+                   or time.monotonic() - self._last_flush >= _MESSAGE_FLUSH_INTERVAL)
+        if due:
+            self.flush_messages()
+
+    def flush_messages(self) -> None:
+        """Write any buffered messages to the database."""
+        with self._message_buffer_lock:
+            if not self._message_buffer:
+                return
+            batch, self._message_buffer = self._message_buffer, []
+            self._last_flush = time.monotonic()
+        self.save_messages(batch)
+    
+    def save_messages(self, messages: List[ChatMessage]) -> None:
+        """Save many chat messages in one transaction.
+
+        Amortizes statement binding and the commit fsync across the
+        batch instead of paying them per row.
+        """
+        if not messages:
+            return
+
         with self.get_connection() as conn:
-            conn.execute("""
-                INSERT OR IGNORE INTO messages (id, user_id, role, content, tokens, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (message.id, message.user_id, message.role, message.content, 
-                  message.tokens, message.created_at.isoformat()))
+            conn.executemany(_SQL_INSERT_MESSAGE,
+                             [(m.id, m.user_id, m.role, m.content,
+                               m.tokens, _to_ms(m.created_at))
+                              for m in messages])
             conn.commit()
-    
+
     def get_recent_messages(self, user_id: int, limit: int = 40) -> List[ChatMessage]:
         """Get recent messages for a user."""
+        self.flush_messages()
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM messages 
-                WHERE user_id = ? 
-                ORDER BY created_at DESC 
-                LIMIT ?
-            """, (user_id, limit))
+            cursor = conn.execute(_SQL_SELECT_RECENT_MESSAGES, (user_id, limit))
             return [ChatMessage.from_row(row) for row in cursor.fetchall()]
     
+    def get_recent_message_stats(self, user_id: int, limit: int = 40) -> Dict[str, int]:
+        """Get count and token total over the recent message window."""
+        self.flush_messages()
+        with self.get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(tokens), 0)
+                FROM (
+                    SELECT tokens FROM messages
+                    WHERE user_id = ?
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                )
+            """, (user_id, limit))
+            count, tokens = cursor.fetchone()
+            return {"message_count": count, "total_tokens": tokens}
+
     def get_messages_by_tokens(self, user_id: int, max_tokens: int) -> List[ChatMessage]:
-        """Get messages up to token limit."""
-        messages = self.get_recent_messages(user_id, limit=1000)
-        
-        total_tokens = 0
-        result = []
-        
-        for message in reversed(messages):  # Start from oldest
-            if total_tokens + message.tokens > max_tokens:
-                break
-            result.append(message)
-            total_tokens += message.tokens
-        
-        return result
+        """Get the newest messages that fit the token limit, oldest first.
+
+        The running token sum is a SQL window function, so SQLite walks
+        the index once in C and only the rows inside the budget are
+        materialized in Python. Note the selection is deliberately the
+        NEWEST messages within the budget — the old Python loop kept
+        the oldest of its fetch window, which starved the context of
+        recent turns once history outgrew the budget.
+        """
+        self.flush_messages()
+        with self.get_connection() as conn:
+            cursor = conn.execute(_SQL_MESSAGES_BY_TOKENS, (user_id, max_tokens))
+            return [ChatMessage.from_row(row) for row in cursor.fetchall()]
     
     def delete_recent_messages(self, user_id: int, count: int) -> int:
         """Delete most recent messages for a user."""
+        self.flush_messages()
         with self.get_connection() as conn:
+            if self._delete_limit_supported is not False:
+                # Direct DELETE ... ORDER BY ... LIMIT avoids the IN
+                # subquery's second index walk, but needs a build with
+                # SQLITE_ENABLE_UPDATE_DELETE_LIMIT; probe once
+                try:
+                    cursor = conn.execute("""
+                        DELETE FROM messages
+                        WHERE user_id = ?
+                        ORDER BY created_at DESC
+                        LIMIT ?
+                    """, (user_id, count))
+                    self._delete_limit_supported = True
+                    conn.commit()
+                    return cursor.rowcount
+                except sqlite3.OperationalError:
+                    self._delete_limit_supported = False
+
             cursor = conn.execute("""
-                DELETE FROM messages 
+                DELETE FROM messages
                 WHERE id IN (
-                    SELECT id FROM messages 
-                    WHERE user_id = ? 
-                    ORDER BY created_at DESC 
+                    SELECT id FROM messages
+                    WHERE user_id = ?
+                    ORDER BY created_at DESC
                     LIMIT ?
                 )
             """, (user_id, count))
@@ -271,7 +548,11 @@ class Database:
     
     def delete_all_user_data(self, user_id: int) -> None:
         """Delete all data for a user."""
+        self.flush_messages()
         with self.get_connection() as conn:
+            # One transaction for all five DELETEs: a single fsync at
+            # commit, and the embeddings sub-select reuses the warm cache
+            conn.execute("BEGIN IMMEDIATE")
             # Delete in correct order due to foreign keys
             conn.execute("DELETE FROM embeddings WHERE file_id IN (SELECT id FROM files WHERE user_id = ?)", (user_id,))
             conn.execute("DELETE FROM files WHERE user_id = ?", (user_id,))
@@ -283,35 +564,42 @@ class Database:
     def save_fact(self, user_id: int, key: str, value: str, 
                   confidence: float = 1.0) -> None:
         """Save or update a user fact."""
-        now = datetime.now().isoformat()
-        
+        now = _now_ms()
+
         with self.get_connection() as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO facts (user_id, key, value, confidence, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (user_id, key, value, confidence, now))
+            conn.execute(_SQL_INSERT_FACT, (user_id, key, value, confidence, now))
             conn.commit()
     
+    def save_facts(self, user_id: int, rows: List[tuple]) -> None:
+        """Save or update many user facts in one transaction.
+
+        Args:
+            rows: List of (key, value, confidence) tuples
+        """
+        if not rows:
+            return
+
+        now = _now_ms()
+
+        with self.get_connection() as conn:
+            conn.executemany(_SQL_INSERT_FACT,
+                             [(user_id, key, value, confidence, now)
+                              for key, value, confidence in rows])
+            conn.commit()
+
     def get_facts(self, user_id: int, limit: int = 10) -> List[Fact]:
         """Get user facts ordered by confidence."""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM facts 
-                WHERE user_id = ? 
-                ORDER BY confidence DESC, updated_at DESC 
-                LIMIT ?
-            """, (user_id, limit))
+            cursor = conn.execute(_SQL_SELECT_FACTS, (user_id, limit))
             return [Fact.from_row(row) for row in cursor.fetchall()]
     
     def save_file(self, file_record: FileRecord) -> None:
         """Save file record."""
         with self.get_connection() as conn:
-            conn.execute("""
-                INSERT OR IGNORE INTO files (id, user_id, tg_file_id, mime, name, path, size, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (file_record.id, file_record.user_id, file_record.tg_file_id,
-                  file_record.mime, file_record.name, file_record.path, 
-                  file_record.size, file_record.created_at.isoformat()))
+            conn.execute(_SQL_INSERT_FILE,
+                         (file_record.id, file_record.user_id, file_record.tg_file_id,
+                          file_record.mime, file_record.name, file_record.path,
+                          file_record.size, _to_ms(file_record.created_at)))
             conn.commit()
     
     def get_user_files(self, user_id: int) -> List[FileRecord]:
@@ -324,19 +612,105 @@ class Database:
             """, (user_id,))
             return [FileRecord.from_row(row) for row in cursor.fetchall()]
     
+    def add_user_doc_ids(self, user_id: int, collection: str,
+                         doc_ids: List[str]) -> None:
+        """Record vector-store document IDs owned by a user."""
+        if not doc_ids:
+            return
+
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO user_doc_ids (user_id, doc_id, collection)
+                VALUES (?, ?, ?)
+            """, [(user_id, doc_id, collection) for doc_id in doc_ids])
+            conn.commit()
+
+    def get_user_doc_ids(self, user_id: int, collection: str) -> List[str]:
+        """Get a user's vector-store document IDs for a collection."""
+        with self.get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT doc_id FROM user_doc_ids
+                WHERE user_id = ? AND collection = ?
+            """, (user_id, collection))
+            return [row[0] for row in cursor.fetchall()]
+
+    def count_user_docs(self, user_id: int, collection: str) -> int:
+        """Count a user's vector-store documents in a collection."""
+        with self.get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT COUNT(*) FROM user_doc_ids
+                WHERE user_id = ? AND collection = ?
+            """, (user_id, collection))
+            return cursor.fetchone()[0]
+
+    def delete_user_doc_ids(self, user_id: int) -> None:
+        """Delete a user's vector-store document ID records."""
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM user_doc_ids WHERE user_id = ?", (user_id,))
+            conn.commit()
+
+    def get_file_stats(self, user_id: int) -> Dict[str, Any]:
+        """Get file count, total size and per-extension counts."""
+        with self.get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(size), 0)
+                FROM files WHERE user_id = ?
+            """, (user_id,))
+            file_count, total_size = cursor.fetchone()
+
+            # Histogram over bare names only; no FileRecord/datetime
+            # materialization per row (SQLite has no rsplit, so the
+            # suffix is taken in Python)
+            file_types: Dict[str, int] = {}
+            cursor = conn.execute(
+                "SELECT name FROM files WHERE user_id = ?", (user_id,)
+            )
+            for (name,) in cursor:
+                ext = Path(name).suffix.lower()
+                file_types[ext] = file_types.get(ext, 0) + 1
+
+            return {
+                "file_count": file_count,
+                "total_size": total_size,
+                "file_types": file_types,
+            }
+
     def get_stats(self, user_id: int) -> Dict[str, int]:
         """Get user statistics."""
+        self.flush_messages()
         with self.get_connection() as conn:
+            # COUNT and SUM over messages share one index scan; the old
+            # correlated sub-selects walked the messages index twice.
+            # files/facts counts stay as cheap separate lookups
             cursor = conn.execute("""
-                SELECT 
-                    (SELECT COUNT(*) FROM messages WHERE user_id = ?) as message_count,
-                    (SELECT COUNT(*) FROM files WHERE user_id = ?) as file_count,
-                    (SELECT COUNT(*) FROM facts WHERE user_id = ?) as fact_count,
-                    (SELECT SUM(tokens) FROM messages WHERE user_id = ?) as total_tokens
-            """, (user_id, user_id, user_id, user_id))
-            row = cursor.fetchone()
-            return dict(row) if row else {}
+                SELECT COUNT(*), COALESCE(SUM(tokens), 0)
+                FROM messages WHERE user_id = ?
+            """, (user_id,))
+            message_count, total_tokens = cursor.fetchone()
+            file_count = conn.execute(
+                "SELECT COUNT(*) FROM files WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+            fact_count = conn.execute(
+                "SELECT COUNT(*) FROM facts WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+            return {
+                "message_count": message_count,
+                "file_count": file_count,
+                "fact_count": fact_count,
+                "total_tokens": total_tokens,
+            }
+
+
+# Global database instance, created lazily on first access so importing
+# this module for the dataclasses doesn't open the database
+_db: Optional[Database] = None
 
 
-# Global database instance
-db = Database()
\ No newline at end of file
+def __getattr__(name: str):
+    """Lazily construct the module-level database singleton."""
+    if name == "db":
+        global _db
+        if _db is None:
+            _db = Database()
+        return _db
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -4,10 +4,10 @@ import logging
 import mimetypes
 import os
 import uuid
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, List
 
-import aiofiles
 from pypdf import PdfReader
 from docx import Document
 
@@ -15,7 +15,7 @@ from app.storage.db import FileRecord, db
 from app.nlp.chunk import chunker
 from app.nlp.summarize import summarizer
 from app.memory.long_term import long_memory
-from app.utils.tokens import count_tokens
+from app.utils.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -30,23 +30,26 @@ class FileProcessor:
         self.allowed_types = os.getenv("ALLOWED_FILE_TYPES", "pdf,docx,txt,md").split(",")
     
     async def save_file(self, user_id: int, tg_file_id: str, file_name: str,
-                       mime_type: str, file_data: bytes) -> Optional[FileRecord]:
-        """Save uploaded file and process it."""
-        if len(file_data) > self.max_file_size:
+                       mime_type: str, message) -> Optional[FileRecord]:
+        """Save an uploaded Telegram file and process it.
+
+        The media is streamed straight to disk via download_media
+        instead of being buffered as one bytes object in memory.
+        """
+        if message.file and message.file.size and message.file.size > self.max_file_size:
             raise ValueError(f"File too large. Max size: {self.max_file_size // 1024 // 1024}MB")
-        
+
         # Create user directory
         user_dir = self.upload_dir / str(user_id)
         user_dir.mkdir(parents=True, exist_ok=True)
-        
+
         # Generate unique filename
         file_id = str(uuid.uuid4())
         file_path = user_dir / f"{file_id}_{file_name}"
-        
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(file_data)
-        
+
+        # Stream file to disk
+        await message.download_media(file=str(file_path))
+
         # Create file record
         file_record = FileRecord(
             id=file_id,
@@ -55,7 +58,7 @@ class FileProcessor:
             mime=mime_type,
             name=file_name,
             path=str(file_path),
-            size=len(file_data),
+            size=file_path.stat().st_size,
             created_at=datetime.now()
         )
         
@@ -73,14 +76,17 @@ class FileProcessor:
     
     async def _extract_content(self, file_path: Path, mime_type: str) -> Optional[str]:
         """Extract text content from file."""
+        # Parsing is CPU/disk-bound; run it in a worker thread so a large
+        # PDF doesn't stall the event loop (and every other chat) while
+        # it is being extracted
         try:
             if mime_type == "application/pdf":
-                return self._extract_pdf(file_path)
-            elif mime_type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document", 
+                return await asyncio.to_thread(self._extract_pdf, file_path)
+            elif mime_type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                              "application/msword"]:
-                return self._extract_docx(file_path)
+                return await asyncio.to_thread(self._extract_docx, file_path)
             elif mime_type.startswith("text/"):
-                return self._extract_text(file_path)
+                return await asyncio.to_thread(self._extract_text, file_path)
             else:
                 logger.warning(f"Unsupported file type: {mime_type}")
                 return None
@@ -91,22 +97,14 @@ class FileProcessor:
     def _extract_pdf(self, file_path: Path) -> str:
         """Extract text from PDF."""
         reader = PdfReader(file_path)
-        text = ""
-        
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        
-        return text.strip()
-    
+        # Single join instead of repeated string concatenation, which
+        # copies the accumulated text on every page
+        return "\n".join(page.extract_text() for page in reader.pages).strip()
+
     def _extract_docx(self, file_path: Path) -> str:
         """Extract text from DOCX."""
         doc = Document(file_path)
-        text = ""
-        
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        
-        return text.strip()
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
     
     def _extract_text(self, file_path: Path) -> str:
         """Extract text from text file."""
@@ -134,7 +132,11 @@ class FileProcessor:
         # Generate summary
         summary = await summarizer.summarize_file(file_name, content)
         
-        logger.info(f"Processed file {file_name}: {len(chunks)} chunks, {count_tokens(content)} tokens")
+        # Rough estimate is enough for a log line; an exact tiktoken
+        # pass over the whole document would cost more than the logging
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Processed file {file_name}: {len(chunks)} chunks, "
+                        f"~{estimate_tokens(content)} tokens")
     
     def get_user_files(self, user_id: int) -> List[FileRecord]:
         """Get all files for a user."""
@@ -153,21 +155,19 @@ class FileProcessor:
     
     def get_file_stats(self, user_id: int) -> dict:
         """Get file statistics for a user."""
-        files = self.get_user_files(user_id)
-        
-        total_size = sum(f.size for f in files)
-        file_types = {}
-        
-        for file in files:
-            ext = Path(file.name).suffix.lower()
-            file_types[ext] = file_types.get(ext, 0) + 1
-        
-        return {
-            "file_count": len(files),
-            "total_size": total_size,
-            "file_types": file_types
-        }
+        # Aggregated in SQL; no FileRecord materialization per file
+        return db.get_file_stats(user_id)
+
+
+# Global instance, created lazily on first access
+_file_processor: Optional[FileProcessor] = None
 
 
-# Global instance
-file_processor = FileProcessor()
\ No newline at end of file
+def __getattr__(name: str):
+    """Lazily construct the module-level processor singleton."""
+    if name == "file_processor":
+        global _file_processor
+        if _file_processor is None:
+            _file_processor = FileProcessor()
+        return _file_processor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -10,7 +10,7 @@ from telethon import TelegramClient as TelethonClient
 from telethon import events
 from telethon.tl.types import UserStatusOffline
 
-from app.storage.db import db
+from app.storage.db import db, _MESSAGE_FLUSH_INTERVAL
 from app.memory.short_term import short_memory
 from app.memory.long_term import long_memory
 from app.memory.facts import facts_store
@@ -45,22 +45,43 @@ class TelegramClient:
         
         self.router = CommandRouter()
         self.owner_id = int(os.getenv("OWNER_USER_ID", 0))
+        self._me_id = None
     
     async def start(self):
         """Start the Telegram client."""
         logger.info("Starting Telegram client...")
         
         await self.client.start()
-        
+
+        # Cache our own user id once; get_me() is a network round-trip
+        # and the id never changes for the lifetime of the session
+        me = await self.client.get_me()
+        self._me_id = me.id
+
         # Register event handlers
         self.client.add_event_handler(self.handle_new_message, events.NewMessage)
         self.client.add_event_handler(self.handle_system_config, events.NewMessage(func=lambda e: e.sender_id == self.owner_id))
         
         logger.info("Telegram client started successfully")
-        
-        # Run until disconnected
-        await self.client.run_until_disconnected()
-    
+
+        # Background writer for the message buffer: save_message only
+        # flushes on the next call once the window lapses, so without
+        # this a trailing message would sit buffered while the chat is
+        # idle
+        flusher = asyncio.create_task(self._flush_messages_loop())
+        try:
+            # Run until disconnected
+            await self.client.run_until_disconnected()
+        finally:
+            flusher.cancel()
+            await asyncio.to_thread(db.flush_messages)
+
+    async def _flush_messages_loop(self):
+        """Flush buffered message writes on the batching interval."""
+        while True:
+            await asyncio.sleep(_MESSAGE_FLUSH_INTERVAL)
+            await asyncio.to_thread(db.flush_messages)
+
     async def handle_new_message(self, event):
         """Handle new messages with offline detection."""
         # Skip if not direct message
@@ -70,8 +91,7 @@ class TelegramClient:
         user_id = event.sender_id
         
         # Security: Never reply to bot's own account
-        me = await self.client.get_me()
-        if user_id == me.id:
+        if user_id == self._me_id:
             logger.info(f"Skipping message from bot's own account {user_id}")
             return
         
@@ -103,8 +123,7 @@ class TelegramClient:
         """Process a regular message with training system integration."""
         try:
             # Security: Never process messages from bot's own account
-            me = await self.client.get_me()
-            if user_id == me.id:
+            if user_id == self._me_id:
                 logger.info(f"Skipping message processing for bot's own account {user_id}")
                 return
                 
@@ -196,16 +215,14 @@ class TelegramClient:
             return
         
         try:
-            file_data = await event.download_media(bytes)
             file_name = "config_update.txt"
-            
-            # Save configuration file
+
+            # Stream the file straight to disk instead of buffering the
+            # whole download in memory first
             config_path = Path("config") / file_name
             config_path.parent.mkdir(exist_ok=True)
-            
-            with open(config_path, 'wb') as f:
-                f.write(file_data)
-            
+            await event.download_media(file=str(config_path))
+
             # Load configuration from file
             if system_data.load_from_txt_file(str(config_path)):
                 await event.reply("✅ Configuration updated from file")
@@ -218,12 +235,16 @@ class TelegramClient:
     
     async def build_context_with_training(self, user_id: int, current_message: str) -> list:
         """Build context with training system integration."""
-        # Get dynamic system prompt
-        system_prompt = system_data.get_system_prompt("default")
-        
-        # Get user training context
-        training_context = user_info_manager.get_user_training_context(user_id)
-        
+        # The four context sources are independent lookups (config,
+        # training store, SQLite, ChromaDB); fetch them concurrently so
+        # the slowest one bounds the latency instead of their sum
+        system_prompt, training_context, recent_messages, memories = await asyncio.gather(
+            asyncio.to_thread(system_data.get_system_prompt, "default"),
+            asyncio.to_thread(user_info_manager.get_user_training_context, user_id),
+            asyncio.to_thread(short_memory.get_context_messages, user_id),
+            asyncio.to_thread(long_memory.search, user_id, current_message, 5)
+        )
+
         # Build messages
         messages = [{"role": "system", "content": system_prompt}]
         
@@ -237,7 +258,6 @@ class TelegramClient:
             })
         
         # Add recent messages
-        recent_messages = short_memory.get_context_messages(user_id)
         for msg in recent_messages:
             messages.append({
                 "role": msg.role,
@@ -245,7 +265,6 @@ class TelegramClient:
             })
         
         # Add long-term memory
-        memories = long_memory.search(user_id, current_message, top_k=5)
         if memories:
             memory_text = "\n\n".join([m.text for m in memories])
             messages.append({
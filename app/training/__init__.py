@@ -1,11 +1,25 @@
 """Training system for Telegram AI Handler."""
 
-from .system_prompts import training_system
-from .user_info import user_info_manager
-from .bot_workflows import workflow_manager
-
 __all__ = [
     "training_system",
     "user_info_manager",
     "workflow_manager"
-]
\ No newline at end of file
+]
+
+# PEP 562: each manager is resolved on first attribute access, so
+# importing the package (or one submodule) doesn't pull in and
+# construct the siblings
+_SUBMODULES = {
+    "training_system": "system_prompts",
+    "user_info_manager": "user_info",
+    "workflow_manager": "bot_workflows",
+}
+
+
+def __getattr__(name: str):
+    """Lazily resolve the managers from their submodules."""
+    submodule = _SUBMODULES.get(name)
+    if submodule is not None:
+        from importlib import import_module
+        return getattr(import_module(f".{submodule}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
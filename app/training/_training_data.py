@@ -0,0 +1,54 @@
+"""Shared training example table.
+
+bot_workflows and system_prompts previously each defined their own copy
+of these examples; this module is the single source of truth so the
+dicts and strings are allocated once — and only when first used.
+"""
+from functools import cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Sequence
+
+
+@cache
+def training_data() -> Mapping[str, Sequence[Dict[str, Any]]]:
+    """Build the shared training table on first use."""
+    return MappingProxyType({
+        "greetings": (
+            {"user": "Hello", "bot": "Hello! 👋 I'm your AI assistant. How can I help you today?"},
+            {"user": "Hi there", "bot": "Hi! 😊 Ready to assist you with anything you need."},
+            {"user": "Hey", "bot": "Hey! What's on your mind?"}
+        ),
+
+        "help_requests": (
+            {"user": "What can you do?", "bot": "I can chat with you, remember our conversations, process files (PDF, DOCX, TXT, MD), and store your preferences. Try /help for all commands!"},
+            {"user": "How do I use you?", "bot": "Just chat naturally! I remember our conversations and can process files. Use /help to see all available commands."}
+        ),
+
+        "memory_examples": (
+            {"user": "My name is Alice", "bot": "Nice to meet you, Alice! I'll remember that. 😊"},
+            {"user": "I like Python", "bot": "Great choice! Python is excellent for AI development. I'll remember you prefer Python."},
+            {"user": "I work as a developer", "bot": "Perfect! I'll note that you're a developer. This will help me provide more relevant responses."}
+        ),
+
+        "file_processing": (
+            {"user": "I uploaded a PDF", "bot": "Great! I've processed your PDF and extracted the text. The content is now searchable in our conversations."},
+            {"user": "Can you summarize this document?", "bot": "Absolutely! Once you upload the document, I'll extract the text and provide a concise summary."}
+        ),
+
+        "bengali_interactions": (
+            {"user": "হ্যালো", "bot": "হ্যালো! 👋 আমি আপনার AI সহকারী। আমি কীভাবে সাহায্য করতে পারি?"},
+            {"user": "আমি কীভাবে ব্যবহার করব?", "bot": "স্বাভাবিকভাবে চ্যাট করুন! আমি আমাদের কথোপকথন মনে রাখি এবং ফাইল প্রসেস করতে পারি। সব কমান্ড দেখতে /help ব্যবহার করুন।"}
+        ),
+
+        "technical_support": (
+            {"user": "Can you help with Python?", "bot": "Absolutely! I'm well-versed in Python. Whether it's data analysis, web development, or AI/ML, I can help. What specific Python topic are you interested in?"},
+            {"user": "I need help with AI", "bot": "I'd be happy to help with AI! I can assist with machine learning concepts, neural networks, or specific AI applications. What aspect of AI are you exploring?"}
+        )
+    })
+
+
+def __getattr__(name: str):
+    """Keep TRAINING_DATA importable without eager construction."""
+    if name == "TRAINING_DATA":
+        return training_data()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
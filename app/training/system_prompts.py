@@ -1,23 +1,32 @@
 """System prompts and training data management."""
-import logging
-from typing import Dict, List, Any, Optional
-
-logger = logging.getLogger(__name__)
-
-
-class TrainingSystem:
-    """Manages training data, system prompts, and bot workflows."""
-    
-    def __init__(self):
-        """Initialize training system."""
-        self.system_prompts = self._load_system_prompts()
-        self.training_data = self._load_training_data()
-        self.bot_workflows = self._load_bot_workflows()
-    
-    def _load_system_prompts(self) -> Dict[str, str]:
-        """Load system prompts for different contexts."""
-        return {
-            "default": """You are a professional AI assistant with advanced memory capabilities, designed for enterprise-level service.
+import sys
+import time
+from functools import cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from app.training._training_data import training_data
+from app.memory.facts import facts_store
+
+# Shared read-only empties for lookup misses; returning these instead
+# of fresh {} / [] keeps the miss path allocation-free
+_EMPTY_MAP: Mapping[str, Any] = MappingProxyType({})
+_EMPTY_SEQ: tuple = ()
+
+
+@cache
+def _system_prompts() -> Mapping[str, str]:
+    """Build the prompt table on first use.
+
+    Read-only reference data, deferred behind a cache so importing the
+    module doesn't pay for the literals.
+    sys.intern the prompt bodies: CPython only auto-interns short
+    identifier-like strings, so interning the multi-KB prompts
+    guarantees a single stored copy and identity-fast comparisons
+    downstream.
+    """
+    return MappingProxyType({k: sys.intern(v) for k, v in {
+        "default": """You are a professional AI assistant with advanced memory capabilities, designed for enterprise-level service.
 
 Core Principles:
 - Maintain professional tone while being approachable
@@ -53,8 +62,8 @@ Knowledge Domains:
 - Data analysis and insights
 - Creative problem-solving
 - Professional development and strategy""",
-            
-            "bengali": """আপনি একটি সহায়ক, প্রসঙ্গ-সচেতন সহকারী যিনি টেলিগ্রামে চ্যাট করছেন।
+
+        "bengali": """আপনি একটি সহায়ক, প্রসঙ্গ-সচেতন সহকারী যিনি টেলিগ্রামে চ্যাট করছেন।
 
 মূল ব্যক্তিত্ব:
 - ব্যবহারকারীর পছন্দসই ভাষা ব্যবহার করুন যদি জানা থাকে; অন্যথায় ব্যবহারকারীকে অনুকরণ করুন
@@ -63,8 +72,8 @@ Knowledge Domains:
 - যদি ব্যবহারকারী মুছে ফেলা বা গোপনীয়তা তথ্য অনুরোধ করে, অবিলম্বে সম্মত হন
 - ব্যবহারকারী বিস্তারিত জিজ্ঞাসা না করা পর্যন্ত সংক্ষিপ্ত উত্তর দিন
 - যদি আপনি নিশ্চিত না হন, একটি সংক্ষিপ্ত স্পষ্টীকরণ প্রশ্ন জিজ্ঞাসা করুন""",
-            
-            "expert": """You are an expert-level, context-aware assistant with deep technical knowledge.
+
+        "expert": """You are an expert-level, context-aware assistant with deep technical knowledge.
 
 Expertise Areas:
 - Advanced programming and software development
@@ -86,8 +95,8 @@ Memory Usage:
 - Reference specific tools and frameworks mentioned
 - Update technical preferences and expertise levels
 - Track project contexts and technical requirements""",
-            
-            "concise": """You are a concise, efficient assistant focused on brevity.
+
+        "concise": """You are a concise, efficient assistant focused on brevity.
 
 Communication Style:
 - Provide brief, direct answers
@@ -100,106 +109,168 @@ Memory Usage:
 - Keep responses under 100 words when possible
 - Focus on actionable information
 - Skip pleasantries unless contextually appropriate"""
+    }.items()})
+
+
+@cache
+def _bot_workflows() -> Mapping[str, Dict[str, Any]]:
+    """Build the workflow outline table on first use."""
+    return MappingProxyType({
+        "file_upload_workflow": {
+            "steps": (
+                "1. User uploads file",
+                "2. Bot saves file to storage",
+                "3. Bot extracts text content",
+                "4. Bot chunks text for embedding",
+                "5. Bot stores embeddings in vector DB",
+                "6. Bot provides summary to user"
+            ),
+            "response_template": "✅ File '{filename}' processed successfully!\n📊 Summary: {summary}\n💾 Stored: {chunks} chunks"
+        },
+
+        "memory_management_workflow": {
+            "steps": (
+                "1. User sends message",
+                "2. Bot adds to short-term memory",
+                "3. Bot extracts facts",
+                "4. Bot updates user preferences",
+                "5. Bot responds with context"
+            ),
+            "response_template": "I've added this to our conversation and updated your preferences."
+        },
+
+        "data_deletion_workflow": {
+            "steps": (
+                "1. User requests deletion",
+                "2. Bot confirms action",
+                "3. Bot deletes all user data",
+                "4. Bot confirms completion"
+            ),
+            "response_template": "🗑️ All your data has been permanently deleted."
         }
-    
-    def _load_training_data(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Load training data for different scenarios."""
-        return {
-            "greetings": [
-                {"user": "Hello", "bot": "Hello! 👋 I'm your AI assistant. How can I help you today?"},
-                {"user": "Hi there", "bot": "Hi! 😊 Ready to assist you with anything you need."},
-                {"user": "Hey", "bot": "Hey! What's on your mind?"}
-            ],
-            
-            "help_requests": [
-                {"user": "What can you do?", "bot": "I can chat with you, remember our conversations, process files (PDF, DOCX, TXT, MD), and store your preferences. Try /help for all commands!"},
-                {"user": "How do I use you?", "bot": "Just chat naturally! I remember our conversations and can process files. Use /help to see all available commands."}
-            ],
-            
-            "memory_examples": [
-                {"user": "My name is Alice", "bot": "Nice to meet you, Alice! I'll remember that. 😊"},
-                {"user": "I like Python", "bot": "Great choice! Python is excellent for AI development. I'll remember you prefer Python."},
-                {"user": "I work as a developer", "bot": "Perfect! I'll note that you're a developer. This will help me provide more relevant responses."}
-            ],
-            
-            "file_processing": [
-                {"user": "I uploaded a PDF", "bot": "Great! I've processed your PDF and extracted the text. The content is now searchable in our conversations."},
-                {"user": "Can you summarize this document?", "bot": "Absolutely! Once you upload the document, I'll extract the text and provide a concise summary."}
-            ]
-        }
-    
-    def _load_bot_workflows(self) -> Dict[str, Dict[str, Any]]:
-        """Load bot workflows for different scenarios."""
-        return {
-            "file_upload_workflow": {
-                "steps": [
-                    "1. User uploads file",
-                    "2. Bot saves file to storage",
-                    "3. Bot extracts text content",
-                    "4. Bot chunks text for embedding",
-                    "5. Bot stores embeddings in vector DB",
-                    "6. Bot provides summary to user"
-                ],
-                "response_template": "✅ File '{filename}' processed successfully!\n📊 Summary: {summary}\n💾 Stored: {chunks} chunks"
-            },
-            
-            "memory_management_workflow": {
-                "steps": [
-                    "1. User sends message",
-                    "2. Bot adds to short-term memory",
-                    "3. Bot extracts facts",
-                    "4. Bot updates user preferences",
-                    "5. Bot responds with context"
-                ],
-                "response_template": "I've added this to our conversation and updated your preferences."
-            },
-            
-            "data_deletion_workflow": {
-                "steps": [
-                    "1. User requests deletion",
-                    "2. Bot confirms action",
-                    "3. Bot deletes all user data",
-                    "4. Bot confirms completion"
-                ],
-                "response_template": "🗑️ All your data has been permanently deleted."
-            }
-        }
-    
-    def get_system_prompt(self, mode: str = "default") -> str:
-        """Get system prompt for specified mode."""
-        return self.system_prompts.get(mode, self.system_prompts["default"])
-    
-    def get_training_examples(self, category: str) -> List[Dict[str, Any]]:
-        """Get training examples for a category."""
-        return self.training_data.get(category, [])
-    
-    def get_workflow(self, workflow_name: str) -> Dict[str, Any]:
-        """Get workflow definition."""
-        return self.bot_workflows.get(workflow_name, {})
-    
-    def get_context_prompt(self, user_id: int, mode: str = "default") -> str:
-        """Get context-aware system prompt."""
-        base_prompt = self.get_system_prompt(mode)
-        
-        # Add user-specific context
-        from app.memory.facts import facts_store
-        facts = facts_store.get_facts_dict(user_id, limit=5)
-        
-        if facts:
-            user_context = "\n".join([f"- {k}: {v}" for k, v in facts.items()])
-            return f"{base_prompt}\n\nUser Context:\n{user_context}"
-        
-        return base_prompt
-    
-    def get_training_context(self, user_id: int, query: str) -> Dict[str, Any]:
-        """Get training context for a specific query."""
-        return {
-            "system_prompt": self.get_context_prompt(user_id),
-            "training_examples": self.get_training_examples("greetings"),
-            "workflow": self.get_workflow("memory_management_workflow"),
-            "user_facts": {}
-        }
+    })
+
+
+# Cached over a fixed key space of a handful of modes/workflows: every
+# chat turn hits these, and the cache turns the call plus fallback
+# logic into one C-level table hit
+@cache
+def get_system_prompt(mode: str = "default") -> str:
+    """Get system prompt for specified mode."""
+    prompts = _system_prompts()
+    return prompts.get(mode, prompts["default"])
+
+
+def get_training_examples(category: str) -> Sequence[Dict[str, Any]]:
+    """Get training examples for a category."""
+    return training_data().get(category, _EMPTY_SEQ)
+
+
+@cache
+def get_workflow(workflow_name: str) -> Mapping[str, Any]:
+    """Get workflow definition."""
+    return _bot_workflows().get(workflow_name, _EMPTY_MAP)
+
+
+# Facts change at most once every few turns, but get_context_prompt runs
+# on every message; a short per-user TTL turns the facts read into an
+# in-process dict hit for the common case, and the writer invalidates on
+# update so staleness is bounded well below the TTL in practice
+# The context prompt always has this shape; %-formatting two positional
+# args into a module constant beats rebuilding the string piecewise
+_CTX_TEMPLATE = "%s\n\nUser Context:\n%s"
+
+_FACTS_TTL = 30.0
+_FACTS_CACHE_MAX = 4096
+_FACTS_CACHE: Dict[int, tuple] = {}
+
+
+def _cached_facts(user_id: int) -> Dict[str, str]:
+    """Get the user's facts, re-reading the store at most per TTL."""
+    entry = _FACTS_CACHE.get(user_id)
+    now = time.monotonic()
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    facts = facts_store.get_facts_dict(user_id, limit=5)
+    if len(_FACTS_CACHE) >= _FACTS_CACHE_MAX:
+        # Entries expire in seconds anyway; a flush is cheaper than LRU
+        # bookkeeping on every hit
+        _FACTS_CACHE.clear()
+    _FACTS_CACHE[user_id] = (now + _FACTS_TTL, facts)
+    return facts
+
+
+def invalidate_facts_cache(user_id: int) -> None:
+    """Drop cached facts for a user; called by the facts writer."""
+    _FACTS_CACHE.pop(user_id, None)
+
+
+def get_context_prompt(user_id: int, mode: str = "default") -> str:
+    """Get context-aware system prompt."""
+    base_prompt = get_system_prompt(mode)
+
+    # Add user-specific context
+    facts = _cached_facts(user_id)
+
+    if facts:
+        # Generator straight into join (no intermediate list); the
+        # context body is built with a single join
+        user_context = "\n".join(f"- {k}: {v}" for k, v in facts.items())
+        return _CTX_TEMPLATE % (base_prompt, user_context)
+
+    return base_prompt
+
+
+def get_training_context(user_id: int, query: str) -> Dict[str, Any]:
+    """Get training context for a specific query."""
+    return {
+        "system_prompt": get_context_prompt(user_id),
+        "training_examples": get_training_examples("greetings"),
+        "workflow": get_workflow("memory_management_workflow"),
+        "user_facts": {}
+    }
+
+
+class _TrainingSystem:
+    """Facade over the module functions.
+
+    The table attributes resolve through the cached builders on each
+    access, so constructing the facade builds nothing — the tables
+    appear only when a caller first touches them.
+    """
+
+    get_system_prompt = staticmethod(get_system_prompt)
+    get_training_examples = staticmethod(get_training_examples)
+    get_workflow = staticmethod(get_workflow)
+    get_context_prompt = staticmethod(get_context_prompt)
+    get_training_context = staticmethod(get_training_context)
+
+    @property
+    def system_prompts(self) -> Mapping[str, str]:
+        return _system_prompts()
+
+    @property
+    def training_data(self) -> Mapping[str, Any]:
+        return training_data()
+
+    @property
+    def bot_workflows(self) -> Mapping[str, Dict[str, Any]]:
+        return _bot_workflows()
+
+
+_training_system: Optional[_TrainingSystem] = None
+
 
+def __getattr__(name: str):
+    """Lazily construct the module-level manager singleton.
 
-# Global instance
-training_system = TrainingSystem()
\ No newline at end of file
+    Compatibility surface: callers keep using training_system.<name>,
+    but none of the tables are built until first touched.
+    """
+    if name == "training_system":
+        global _training_system
+        if _training_system is None:
+            _training_system = _TrainingSystem()
+        return _training_system
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
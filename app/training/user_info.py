@@ -1,20 +1,52 @@
 """User information management and training data."""
+import hashlib
 import logging
+import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+import orjson
+
 from app.storage.db import db
 from app.memory.facts import facts_store
+from app.training._training_data import training_data
 
 logger = logging.getLogger(__name__)
 
+# Fact tokens that mark a technical user; checked by set intersection
+# against a tokenized lowercase view of the fact values instead of
+# stringifying and rescanning the whole dict per term
+_TECHNICAL_TERMS = frozenset({"python", "javascript", "ai", "ml", "programming", "developer"})
+_SUPPORT_TERMS = frozenset({"python", "developer", "programming"})
+
+# Static head of the dynamic system prompt; users with all-default
+# context get this constant back without any string building
+_BASE_PROMPT = """You are a helpful, context-aware assistant chatting in Telegram.
+
+Core Instructions:
+- Always use the user's preferred language if known; else mirror the user
+- Remember at least the last 40 messages per user (short-term), and augment with relevant long-term memory
+- When referring to earlier uploads or facts, be specific and cite the file name or date
+- If the user requests deletion or privacy info, comply immediately
+- Keep answers concise unless the user asks for detail
+- If you're unsure, ask a brief clarifying question
+
+User Context:
+"""
+
 
 class UserInfoManager:
     """Manages user information and training data."""
     
+    # Training context only changes when facts change, but it was
+    # rebuilt (facts read plus dozens of dict/list allocations) on
+    # every call; repeat calls within a conversation reuse the cached
+    # object, and after the TTL a changed fact set forces a rebuild
+    _CTX_TTL = 30.0
+
     def __init__(self):
         """Initialize user info manager."""
-        self.user_profiles = {}
+        self._ctx_cache: Dict[int, tuple] = {}
     
     def create_user_profile(self, user_id: int, username: Optional[str] = None) -> Dict[str, Any]:
         """Create a comprehensive user profile."""
@@ -43,33 +75,60 @@ class UserInfoManager:
     def update_user_preference(self, user_id: int, key: str, value: str, confidence: float = 1.0):
         """Update user preference."""
         facts_store.add_fact(user_id, f"preference_{key}", value, confidence)
+
+    def update_user_preferences(self, user_id: int, preferences: Dict[str, str],
+                                confidence: float = 1.0):
+        """Update many user preferences in one DB round-trip."""
+        facts_store.add_facts(user_id, [(f"preference_{key}", value, confidence)
+                                        for key, value in preferences.items()])
     
     def get_user_training_context(self, user_id: int) -> Dict[str, Any]:
         """Get comprehensive training context for a user."""
+        now = time.monotonic()
+        entry = self._ctx_cache.get(user_id)
+        if entry is not None and now - entry[0] < self._CTX_TTL:
+            return entry[2]
+
         # Get user facts
         facts = facts_store.get_facts_dict(user_id, limit=20)
-        
+
+        # If the facts are unchanged since the cached build, keep the
+        # old context object and just refresh its timestamp
+        version = hash(frozenset(facts.items()))
+        if entry is not None and entry[1] == version:
+            self._ctx_cache[user_id] = (now, version, entry[2])
+            return entry[2]
+
+        # Lowercase and tokenize the fact values once; the expertise
+        # and support detectors intersect against this set instead of
+        # each re-stringifying the whole dict
+        fact_tokens = frozenset(" ".join(facts.values()).lower().split())
+
         # Build training context
         context = {
             "user_id": user_id,
             "facts": facts,
             "preferences": self._extract_preferences(facts),
             "communication_style": self._detect_communication_style(facts),
-            "expertise_level": self._detect_expertise_level(facts),
+            "expertise_level": self._detect_expertise_level(facts, fact_tokens),
             "language_preference": self._detect_language_preference(facts),
-            "training_data": self._get_personalized_training_data(facts)
+            "training_data": self._get_personalized_training_data(facts, fact_tokens)
         }
-        
+
+        self._ctx_cache[user_id] = (now, version, context)
         return context
     
+    # Length of the "preference_" fact-key prefix, sliced off below
+    _PREF_PREFIX_LEN = len("preference_")
+
     def _extract_preferences(self, facts: Dict[str, str]) -> Dict[str, str]:
         """Extract user preferences from facts."""
-        preferences = {}
-        for key, value in facts.items():
-            if key.startswith("preference_"):
-                pref_key = key.replace("preference_", "")
-                preferences[pref_key] = value
-        return preferences
+        # Comprehension instead of loop-and-assign: CPython pre-sizes
+        # the dict and the prefix is sliced off rather than str.replace
+        # rescanning the whole key
+        return {key[self._PREF_PREFIX_LEN:]: value
+                for key, value in facts.items()
+                if key.startswith("preference_")}
     
     def _detect_communication_style(self, facts: Dict[str, str]) -> str:
         """Detect user's preferred communication style."""
@@ -89,24 +148,17 @@ class UserInfoManager:
         
         return "friendly"
     
-    def _detect_expertise_level(self, facts: Dict[str, str]) -> str:
+    def _detect_expertise_level(self, facts: Dict[str, str],
+                                fact_tokens: frozenset) -> str:
         """Detect user's expertise level."""
-        level_indicators = {
-            "expertise": "intermediate",
-            "experience": "medium",
-            "skill_level": "intermediate"
-        }
-        
         # Check for explicit expertise
         if "expertise_level" in facts:
             return facts["expertise_level"]
-        
-        # Detect from technical facts
-        technical_terms = ["python", "javascript", "ai", "ml", "programming", "developer"]
-        for term in technical_terms:
-            if term in str(facts).lower():
-                return "advanced"
-        
+
+        # Detect from technical facts (C-level set intersection)
+        if _TECHNICAL_TERMS & fact_tokens:
+            return "advanced"
+
         return "intermediate"
     
     def _detect_language_preference(self, facts: Dict[str, str]) -> str:
@@ -116,37 +168,20 @@ class UserInfoManager:
         
         return "auto"
     
-    def _get_personalized_training_data(self, facts: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+    def _get_personalized_training_data(self, facts: Dict[str, str],
+                                        fact_tokens: frozenset) -> Dict[str, List[Dict[str, Any]]]:
         """Get personalized training data based on user facts."""
-        training_data = {
-            "greetings": [
-                {"user": "Hello", "bot": "Hello! 👋 I'm your AI assistant. How can I help you today?"},
-                {"user": "Hi there", "bot": "Hi! 😊 Ready to assist you with anything you need."},
-                {"user": "Hey", "bot": "Hey! What's on your mind?"}
-            ],
-            
+        # Static categories come from the shared read-only table; only
+        # the personalized entries are built per call
+        table = training_data()
+        return {
+            "greetings": table["greetings"],
             "personalized_greetings": self._generate_personalized_greetings(facts),
-            
-            "help_requests": [
-                {"user": "What can you do?", "bot": "I can chat with you, remember our conversations, process files (PDF, DOCX, TXT, MD), and store your preferences. Try /help for all commands!"},
-                {"user": "How do I use you?", "bot": "Just chat naturally! I remember our conversations and can process files. Use /help to see all available commands."}
-            ],
-            
-            "memory_examples": [
-                {"user": "My name is Alice", "bot": "Nice to meet you, Alice! I'll remember that. 😊"},
-                {"user": "I like Python", "bot": "Great choice! Python is excellent for AI development. I'll remember you prefer Python."},
-                {"user": "I work as a developer", "bot": "Perfect! I'll note that you're a developer. This will help me provide more relevant responses."}
-            ],
-            
-            "technical_support": self._generate_technical_support(facts),
-            
-            "file_processing": [
-                {"user": "I uploaded a PDF", "bot": "Great! I've processed your PDF and extracted the text. The content is now searchable in our conversations."},
-                {"user": "Can you summarize this document?", "bot": "Absolutely! Once you upload the document, I'll extract the text and provide a concise summary."}
-            ]
+            "help_requests": table["help_requests"],
+            "memory_examples": table["memory_examples"],
+            "technical_support": self._generate_technical_support(fact_tokens),
+            "file_processing": table["file_processing"]
         }
-        
-        return training_data
     
     def _generate_personalized_greetings(self, facts: Dict[str, str]) -> List[Dict[str, Any]]:
         """Generate personalized greetings based on user facts."""
@@ -161,11 +196,11 @@ class UserInfoManager:
         
         return greetings
     
-    def _generate_technical_support(self, facts: Dict[str, str]) -> List[Dict[str, Any]]:
+    def _generate_technical_support(self, fact_tokens: frozenset) -> List[Dict[str, Any]]:
         """Generate technical support based on user expertise."""
         support = []
-        
-        if any(term in str(facts).lower() for term in ["python", "developer", "programming"]):
+
+        if _SUPPORT_TERMS & fact_tokens:
             support.append({
                 "user": "Can you help with Python?",
                 "bot": "Absolutely! I'm well-versed in Python. Whether it's data analysis, web development, or AI/ML, I can help. What specific Python topic are you interested in?"
@@ -184,35 +219,35 @@ class UserInfoManager:
     
     def _build_dynamic_system_prompt(self, context: Dict[str, Any]) -> str:
         """Build dynamic system prompt based on user context."""
-        base_prompt = """You are a helpful, context-aware assistant chatting in Telegram.
-
-Core Instructions:
-- Always use the user's preferred language if known; else mirror the user
-- Remember at least the last 40 messages per user (short-term), and augment with relevant long-term memory
-- When referring to earlier uploads or facts, be specific and cite the file name or date
-- If the user requests deletion or privacy info, comply immediately
-- Keep answers concise unless the user asks for detail
-- If you're unsure, ask a brief clarifying question
+        # Append optional sections to a parts list and join once
+        # instead of += copying the multi-line base per section; the
+        # all-default case returns the module constant untouched
+        parts = [_BASE_PROMPT]
 
-User Context:
-"""
-        
-        # Add user-specific context
         if context["preferences"]:
-            base_prompt += f"\nUser Preferences: {context['preferences']}"
-        
+            # orjson renders the dict at C level, much faster than
+            # dict.__repr__'s Python-level formatting loop
+            prefs_blob = orjson.dumps(context["preferences"]).decode("utf-8")
+            parts.append(f"\nUser Preferences: {prefs_blob}")
+
         if context["language_preference"] != "auto":
-            base_prompt += f"\nLanguage: {context['language_preference']}"
-        
+            parts.append(f"\nLanguage: {context['language_preference']}")
+
         if context["expertise_level"] != "intermediate":
-            base_prompt += f"\nExpertise Level: {context['expertise_level']}"
-        
-        return base_prompt
+            parts.append(f"\nExpertise Level: {context['expertise_level']}")
+
+        if len(parts) == 1:
+            return _BASE_PROMPT
+
+        return "".join(parts)
     
     def add_training_example(self, user_id: int, user_input: str, bot_response: str):
         """Add a training example for this user."""
-        # Store as a fact for this user
-        facts_store.add_fact(user_id, f"training_example_{hash(user_input)}", bot_response, 0.8)
+        # Stable digest instead of hash(): built-in hash is randomized
+        # per process, so the same input would never dedupe across
+        # restarts and the fact table would grow with duplicates
+        key = hashlib.blake2b(user_input.encode('utf-8'), digest_size=8).hexdigest()
+        facts_store.add_fact(user_id, f"training_example_{key}", bot_response, 0.8)
     
     def get_user_training_summary(self, user_id: int) -> Dict[str, Any]:
         """Get summary of user's training data."""
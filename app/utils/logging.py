@@ -1,8 +1,12 @@
 """Logging configuration for the application."""
+import atexit
 import logging
 import os
+import queue
 import sys
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from app.utils.tokens import sanitize_for_logging
@@ -14,37 +18,99 @@ class SensitiveDataFilter(logging.Filter):
     def filter(self, record):
         if hasattr(record, 'msg'):
             record.msg = sanitize_for_logging(str(record.msg))
-        if hasattr(record, 'args'):
-            record.args = tuple(sanitize_for_logging(str(arg)) if isinstance(arg, str) else arg 
-                              for arg in record.args)
+        # QueueHandler merges args into msg and sets args to None
+        # before records reach the downstream handlers
+        if record.args:
+            record.args = tuple(sanitize_for_logging(str(arg)) if isinstance(arg, str) else arg
+                                for arg in record.args)
         return True
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that batches writes instead of flushing per record.
+
+    The file opens lazily (delay=True) with a 64 KiB buffer, and the
+    stream is only flushed for WARNING-or-worse records or when a
+    second has passed since the last flush; routine DEBUG/INFO traffic
+    is absorbed by the buffer. close() still flushes everything.
+    """
+
+    _FLUSH_INTERVAL = 1.0
+
+    def __init__(self, filename):
+        super().__init__(filename, delay=True)
+        self._last_flush = time.monotonic()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            now = time.monotonic()
+            if (record.levelno >= logging.WARNING
+                    or now - self._last_flush > self._FLUSH_INTERVAL):
+                self.stream.flush()
+                self._last_flush = now
+        except Exception:
+            self.handleError(record)
+
+
+# Listener thread that owns the real handlers; kept at module level so
+# it survives setup_logging returning and can be stopped at exit
+_listener: QueueListener = None
+
+# Set after the log directory has been created once, so repeated
+# setup_logging calls (e.g. from tests) skip the mkdir stat syscalls
+_log_dir_ready = False
+
+
 def setup_logging(level: str = "INFO") -> None:
-    """Setup application logging with appropriate format and handlers."""
-    
+    """Setup application logging with appropriate format and handlers.
+
+    Callers only enqueue records: the root logger gets a QueueHandler,
+    and a background QueueListener thread runs the stream/file handlers
+    (and the sensitive-data scrubbing) so request handlers never block
+    on disk I/O or the regex filter.
+    """
+    global _listener, _log_dir_ready
+
     log_level = getattr(logging, level.upper(), logging.INFO)
-    
+
     # Create logs directory
     log_dir = Path("storage/logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler(
-                log_dir / f"telegram_handler_{datetime.now().strftime('%Y%m%d')}.log"
-            )
-        ]
-    )
-    
-    # Add sensitive data filter to all handlers
-    for handler in logging.root.handlers:
-        handler.addFilter(SensitiveDataFilter())
-    
+    if not _log_dir_ready:
+        os.makedirs(log_dir, exist_ok=True)
+        _log_dir_ready = True
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sensitive_filter = SensitiveDataFilter()
+
+    # Real handlers live behind the queue, off the hot path
+    downstream = [
+        logging.StreamHandler(sys.stdout),
+        BufferedFileHandler(
+            log_dir / f"telegram_handler_{datetime.now().strftime('%Y%m%d')}.log"
+        )
+    ]
+    for handler in downstream:
+        handler.setFormatter(formatter)
+        handler.addFilter(sensitive_filter)
+
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    # prepare() pre-formats with the handler's formatter; keep it to
+    # the bare message so the downstream formatter isn't applied twice
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=log_level, handlers=[queue_handler])
+
+    _listener = QueueListener(log_queue, *downstream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
     # Set specific log levels for external libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
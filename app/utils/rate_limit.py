@@ -1,21 +1,25 @@
 """Rate limiting utilities - Disabled for personal use."""
-import asyncio
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict
 
 
 class RateLimiter:
     """Rate limiter for user requests - Disabled for personal use."""
-    
+
+    __slots__ = ("rate_limit", "per", "burst")
+
     def __init__(self, rate_limit: int = 100, per: int = 1, burst: int = 100):
         """Initialize rate limiter - effectively disabled."""
         self.rate_limit = rate_limit
         self.per = per
         self.burst = burst
-    
-    async def acquire(self, user_id: int) -> bool:
-        """Always allow requests for personal use."""
+
+    def acquire(self, user_id: int) -> bool:
+        """Always allow requests for personal use.
+
+        Plain function rather than a coroutine: the always-allow
+        decision doesn't need a coroutine object and an event-loop
+        step per message.
+        """
         return True
     
     def get_stats(self, user_id: int) -> Dict[str, int]:
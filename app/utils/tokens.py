@@ -1,24 +1,43 @@
 """Token utilities for text processing and sanitization."""
 import re
+from functools import lru_cache
 from typing import List, Tuple
 
 import tiktoken
 
 
-def count_tokens(text: str, model: str = "gpt-4") -> int:
-    """Count tokens in text using tiktoken."""
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> "tiktoken.Encoding":
+    """Get the tiktoken encoding for a model, built once per process.
+
+    encoding_for_model does a registry lookup and may rebuild the BPE
+    tables; memoizing per model name makes repeat calls a dict hit.
+    """
     try:
-        encoding = tiktoken.encoding_for_model(model)
-        return len(encoding.encode(text))
+        return tiktoken.encoding_for_model(model)
     except KeyError:
         # Fallback to cl100k_base encoding
-        encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(text))
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Count tokens in text using tiktoken."""
+    # Callers that don't need an exact count can pass model="estimate"
+    # and skip the BPE pass entirely
+    if model == "estimate":
+        return len(text) >> 2
+    return len(_get_encoding(model).encode(text))
+
+
+def count_tokens_batch(texts: List[str], model: str = "gpt-4") -> List[int]:
+    """Count tokens for many texts with one batched encode."""
+    encoding = _get_encoding(model)
+    return [len(tokens) for tokens in encoding.encode_batch(texts)]
 
 
 def truncate_by_tokens(text: str, max_tokens: int, model: str = "gpt-4") -> str:
     """Truncate text to fit within token limit."""
-    encoding = tiktoken.encoding_for_model(model)
+    encoding = _get_encoding(model)
     tokens = encoding.encode(text)
     
     if len(tokens) <= max_tokens:
@@ -29,53 +48,74 @@ def truncate_by_tokens(text: str, max_tokens: int, model: str = "gpt-4") -> str:
     return encoding.decode(truncated_tokens)
 
 
+# Compiled once at import: sanitize_for_logging runs on every log
+# record via SensitiveDataFilter, so per-call pattern compilation (or
+# even the re module's cache lookup) would dominate on short messages.
+# All four scrub rules are fused into one alternation so each record
+# is scanned once instead of once per rule
+_SCRUB_RE = re.compile(
+    r'(?P<phone>\b\d{3}[-.]?\d{3}[-.]?\d{4}\b)'
+    r'|(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<keyname>(?i:api[_-]?key|token|secret))\s*[:=]\s*["\']?[a-zA-Z0-9_\-]{20,}["\']?'
+    r'|(?P<url>https?://[^\s]+)'
+)
+
+# One cheap scan for anything the scrubber could possibly match: a
+# digit (phones, key material), '@' (emails), a URL scheme, or a
+# credential keyword. Most log lines contain none of these and skip
+# the substitution pass entirely
+_TRIAGE_RE = re.compile(r'[\d@]|https?://|key|token|secret', re.IGNORECASE)
+
+
+def _scrub(match: "re.Match[str]") -> str:
+    """Replacement dispatcher for the fused sanitizer pattern."""
+    if match.group("phone") is not None:
+        return '[PHONE]'
+    if match.group("email") is not None:
+        return '[EMAIL]'
+    if match.group("keyname") is not None:
+        return match.group("keyname") + '=[REDACTED]'
+    return '[URL]'
+
+
 def sanitize_for_logging(text: str) -> str:
     """Remove sensitive information from text for logging."""
-    # Remove phone numbers
-    text = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '[PHONE]', text)
-    
-    # Remove email addresses
-    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL]', text)
-    
-    # Remove API keys
-    text = re.sub(r'(?i)(api[_-]?key|token|secret)\s*[:=]\s*["\']?([a-zA-Z0-9_\-]{20,})["\']?', r'\1=[REDACTED]', text)
-    
-    # Remove URLs with sensitive data
-    text = re.sub(r'https?://[^\s]+', '[URL]', text)
-    
-    return text
+    if _TRIAGE_RE.search(text) is None:
+        return text
+    return _SCRUB_RE.sub(_scrub, text)
 
 
 def split_into_chunks(text: str, max_tokens: int, model: str = "gpt-4") -> List[str]:
     """Split text into chunks that fit within token limit."""
-    encoding = tiktoken.encoding_for_model(model)
+    encoding = _get_encoding(model)
     tokens = encoding.encode(text)
-    
+
     chunks = []
     start = 0
-    
+
+    # Each chunk is decoded exactly once; the old loop decoded the
+    # chunk to find a sentence boundary, re-encoded the truncated text
+    # and then decoded the token slice a second time. Now the decoded
+    # text is reused directly and the (small) re-encode only happens
+    # when a boundary is actually taken
     while start < len(tokens):
         end = start + max_tokens
-        
+        chunk_text = encoding.decode(tokens[start:end])
+
         # Try to break at sentence boundaries
         if end < len(tokens):
-            # Look for sentence endings
-            chunk_tokens = tokens[start:end]
-            chunk_text = encoding.decode(chunk_tokens)
-            
-            # Find last sentence ending
             last_period = chunk_text.rfind('. ')
             if last_period > len(chunk_text) * 0.7:  # Only if we have enough content
-                end = start + len(encoding.encode(chunk_text[:last_period + 1]))
-        
-        chunk_tokens = tokens[start:end]
-        chunk_text = encoding.decode(chunk_tokens)
+                chunk_text = chunk_text[:last_period + 1]
+                end = start + len(encoding.encode(chunk_text))
+
         chunks.append(chunk_text)
         start = end
-    
+
     return chunks
 
 
 def estimate_tokens(text: str) -> int:
     """Rough token estimation (1 token ≈ 4 chars)."""
-    return len(text) // 4
\ No newline at end of file
+    # len(text) >> 2 is identical to // 4 for the non-negative length
+    return len(text) >> 2
\ No newline at end of file
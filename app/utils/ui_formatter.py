@@ -1,85 +1,90 @@
 """Professional UI formatting utilities for Telegram bot responses."""
 
 import logging
-from datetime import datetime
+import time
 from typing import Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
+# Size units with their binary magnitude as a shift; checked largest
+# first so format_file_size is one loop with an integer shift per step
+_SIZE_UNITS = (("TB", 40), ("GB", 30), ("MB", 20), ("KB", 10))
+
+# Message prefixes as module constants: two-string concatenation on an
+# existing prefix beats f-string assembly for these tiny payloads
+_OK = "✅ **Success:** "
+_ERR = "❌ **Error:** "
+_WARN = "⚠️ **Warning:** "
+_INFO = "ℹ️ **Info:** "
+
+
+def format_header(title: str, emoji: str = "📊") -> str:
+    """Format a professional header."""
+    return f"{emoji} **{title.upper()}**"
+
+
+def format_section(title: str, content: str, emoji: str = "•") -> str:
+    """Format a professional section."""
+    return f"\n**{title}:**\n{content}"
+
+
+def format_bullet_list(items: List[str], emoji: str = "•") -> str:
+    """Format a professional bullet list."""
+    return "\n".join(f"{emoji} {item}" for item in items)
+
+
+def format_key_value(key: str, value: Any, emoji: str = "→") -> str:
+    """Format key-value pairs professionally."""
+    return f"{emoji} **{key}:** {value}"
+
+
+def format_success(message: str) -> str:
+    """Format success messages."""
+    return _OK + message
+
+
+def format_error(message: str) -> str:
+    """Format error messages."""
+    return _ERR + message
+
+
+def format_warning(message: str) -> str:
+    """Format warning messages."""
+    return _WARN + message
+
+
+def format_info(message: str) -> str:
+    """Format info messages."""
+    return _INFO + message
+
+
+def format_timestamp() -> str:
+    """Format current timestamp professionally."""
+    # time.strftime formats localtime() directly at C level, with
+    # no intermediate datetime object per status card
+    return time.strftime("%Y-%m-%d %H:%M:%S")
 
-class UIFormatter:
-    """Professional UI formatting for Telegram bot responses."""
-    
-    @staticmethod
-    def format_header(title: str, emoji: str = "📊") -> str:
-        """Format a professional header."""
-        return f"{emoji} **{title.upper()}**"
-    
-    @staticmethod
-    def format_section(title: str, content: str, emoji: str = "•") -> str:
-        """Format a professional section."""
-        return f"\n**{title}:**\n{content}"
-    
-    @staticmethod
-    def format_bullet_list(items: List[str], emoji: str = "•") -> str:
-        """Format a professional bullet list."""
-        return "\n".join(f"{emoji} {item}" for item in items)
-    
-    @staticmethod
-    def format_key_value(key: str, value: Any, emoji: str = "→") -> str:
-        """Format key-value pairs professionally."""
-        return f"{emoji} **{key}:** {value}"
-    
-    @staticmethod
-    def format_success(message: str) -> str:
-        """Format success messages."""
-        return f"✅ **Success:** {message}"
-    
-    @staticmethod
-    def format_error(message: str) -> str:
-        """Format error messages."""
-        return f"❌ **Error:** {message}"
-    
-    @staticmethod
-    def format_warning(message: str) -> str:
-        """Format warning messages."""
-        return f"⚠️ **Warning:** {message}"
-    
-    @staticmethod
-    def format_info(message: str) -> str:
-        """Format info messages."""
-        return f"ℹ️ **Info:** {message}"
-    
-    @staticmethod
-    def format_timestamp() -> str:
-        """Format current timestamp professionally."""
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    @staticmethod
-    def format_file_size(bytes_size: int) -> str:
-        """Format file size professionally."""
-        if bytes_size < 1024:
-            return f"{bytes_size} B"
-        elif bytes_size < 1024 * 1024:
-            return f"{bytes_size // 1024} KB"
-        elif bytes_size < 1024 * 1024 * 1024:
-            return f"{bytes_size // (1024 * 1024)} MB"
-        else:
-            return f"{bytes_size // (1024 * 1024 * 1024)} GB"
-
-    @staticmethod
-    def format_status_card(title: str, data: Dict[str, Any]) -> str:
-        """Format a professional status card."""
-        lines = [f"📊 **{title}**"]
-        lines.append("─" * 30)
-        for key, value in data.items():
-            lines.append(f"**{key}:** `{value}`")
-        return "\n".join(lines)
-
-    @staticmethod
-    def format_command_help() -> str:
-        """Format command help professionally."""
-        return """🤖 **Bot Commands**
+
+def format_file_size(bytes_size: int) -> str:
+    """Format file size professionally."""
+    for unit, shift in _SIZE_UNITS:
+        if bytes_size >> shift:
+            return f"{bytes_size >> shift} {unit}"
+    return f"{bytes_size} B"
+
+
+def format_status_card(title: str, data: Dict[str, Any]) -> str:
+    """Format a professional status card."""
+    lines = [f"📊 **{title}**"]
+    lines.append("─" * 30)
+    for key, value in data.items():
+        lines.append(f"**{key}:** `{value}`")
+    return "\n".join(lines)
+
+
+def format_command_help() -> str:
+    """Format command help professionally."""
+    return """🤖 **Bot Commands**
 
 **Owner Commands:**
 `/config start` - Enable auto-reply
@@ -90,11 +95,11 @@ class UIFormatter:
 
 **General Commands:**
 `/help` - Show this help message"""
-    
-    @staticmethod
-    def format_welcome_message() -> str:
-        """Format welcome message professionally."""
-        return """🤖 **Welcome to Telegram Offline AI Assistant!**
+
+
+def format_welcome_message() -> str:
+    """Format welcome message professionally."""
+    return """🤖 **Welcome to Telegram Offline AI Assistant!**
 
 I'm your intelligent assistant that responds only when you're offline.
 
@@ -110,38 +115,64 @@ I'm your intelligent assistant that responds only when you're offline.
 • `/config status` - Check status
 
 Ready to assist you!"""
-    
-    @staticmethod
-    def format_status_report(enabled: bool, config: Dict[str, Any]) -> str:
-        """Format a comprehensive status report."""
-        status = "🟢 **ONLINE**" if enabled else "🔴 **OFFLINE**"
-        
-        lines = [
-            "📊 **System Status Report**",
-            "─" * 30,
-            f"**Status:** {status}",
-            f"**Max Response Length:** {config.get('max_response_length', 800)}",
-            f"**Temperature:** {config.get('temperature', 0.7)}",
-            f"**Top P:** {config.get('top_p', 0.9)}",
-            "",
-            "✅ **System Ready**"
-        ]
-        
-        return "\n".join(lines)
-    
-    @staticmethod
-    def format_config_updated(action: str, details: str = "") -> str:
-        """Format configuration update messages."""
-        return f"✅ **Configuration Updated**\n\n**Action:** {action}\n{details}"
-    
-    @staticmethod
-    def format_error_with_details(error: str, details: str = "") -> str:
-        """Format error messages with details."""
-        message = f"❌ **Error:** {error}"
-        if details:
-            message += f"\n\n**Details:** {details}"
-        return message
+
+
+def format_status_report(enabled: bool, config: Dict[str, Any]) -> str:
+    """Format a comprehensive status report."""
+    status = "🟢 **ONLINE**" if enabled else "🔴 **OFFLINE**"
+
+    lines = [
+        "📊 **System Status Report**",
+        "─" * 30,
+        f"**Status:** {status}",
+        f"**Max Response Length:** {config.get('max_response_length', 800)}",
+        f"**Temperature:** {config.get('temperature', 0.7)}",
+        f"**Top P:** {config.get('top_p', 0.9)}",
+        "",
+        "✅ **System Ready**"
+    ]
+
+    return "\n".join(lines)
+
+
+def format_config_updated(action: str, details: str = "") -> str:
+    """Format configuration update messages."""
+    return f"✅ **Configuration Updated**\n\n**Action:** {action}\n{details}"
+
+
+def format_error_with_details(error: str, details: str = "") -> str:
+    """Format error messages with details."""
+    message = _ERR + error
+    if details:
+        message += f"\n\n**Details:** {details}"
+    return message
+
+
+class UIFormatter:
+    """Thin façade over the module-level formatters.
+
+    The formatters carry no state; calling them as plain functions
+    skips the staticmethod descriptor lookup per call, and this class
+    just keeps the ui_formatter.<name> surface working.
+    """
+
+    format_header = staticmethod(format_header)
+    format_section = staticmethod(format_section)
+    format_bullet_list = staticmethod(format_bullet_list)
+    format_key_value = staticmethod(format_key_value)
+    format_success = staticmethod(format_success)
+    format_error = staticmethod(format_error)
+    format_warning = staticmethod(format_warning)
+    format_info = staticmethod(format_info)
+    format_timestamp = staticmethod(format_timestamp)
+    format_file_size = staticmethod(format_file_size)
+    format_status_card = staticmethod(format_status_card)
+    format_command_help = staticmethod(format_command_help)
+    format_welcome_message = staticmethod(format_welcome_message)
+    format_status_report = staticmethod(format_status_report)
+    format_config_updated = staticmethod(format_config_updated)
+    format_error_with_details = staticmethod(format_error_with_details)
 
 
 # Global formatter instance
-ui_formatter = UIFormatter()
\ No newline at end of file
+ui_formatter = UIFormatter()
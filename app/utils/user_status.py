@@ -1,5 +1,7 @@
 """User status management for offline detection."""
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -13,9 +15,20 @@ logger = logging.getLogger(__name__)
 class UserStatusManager:
     """Manages user online/offline status detection."""
     
+    # How long a fetched bot status stays valid; keeps the reply
+    # decision from issuing a get_entity round-trip per message
+    _STATUS_TTL = 2.0
+
+    # Bounded LRU for per-user status strings; staler statuses can be
+    # cached for longer because they change less often
+    _ENTITY_CACHE_MAX = 256
+
     def __init__(self):
         """Initialize user status manager."""
         self.offline_threshold = timedelta(minutes=5)
+        self._me = None
+        self._status_cache = (0.0, None)
+        self._entity_cache: OrderedDict = OrderedDict()
     
     async def should_reply(self, client: TelegramClient, user_id: int) -> bool:
         """
@@ -34,9 +47,18 @@ class UserStatusManager:
                 logger.info("Auto-reply disabled by owner")
                 return False
             
-            # Check if bot account is online - only reply when bot is offline
-            me = await client.get_me()
-            bot_status = await client.get_entity(me.id)
+            # Check if bot account is online - only reply when bot is
+            # offline. Our own identity never changes, so get_me is
+            # fetched once; the status entity is cached briefly so a
+            # burst of messages costs one MTProto round-trip, not one
+            # per message
+            if self._me is None:
+                self._me = await client.get_me()
+
+            ts, bot_status = self._status_cache
+            if bot_status is None or time.monotonic() - ts >= self._STATUS_TTL:
+                bot_status = await client.get_entity(self._me.id)
+                self._status_cache = (time.monotonic(), bot_status)
             
             # If bot account is online, don't reply
             if hasattr(bot_status, 'status') and bot_status.status is None:
@@ -63,27 +85,44 @@ class UserStatusManager:
         Returns:
             String describing user status
         """
+        now = time.monotonic()
+        cached = self._entity_cache.get(user_id)
+        if cached is not None:
+            expires, result = cached
+            if now < expires:
+                self._entity_cache.move_to_end(user_id)
+                return result
+            del self._entity_cache[user_id]
+
         try:
             user = await client.get_entity(user_id)
-            
+
             if not hasattr(user, 'status') or not user.status:
                 return "Unknown"
-            
+
             status = user.status
-            
+
+            # TTL scales with how quickly the status can change:
+            # long-idle users keep their answer for an hour, recent
+            # ones for a minute, online users are never cached
             if status is None:
                 return "Online"
             elif isinstance(status, UserStatusOffline):
-                return f"Offline since {status.was_online}"
+                result, ttl = f"Offline since {status.was_online}", 60.0
             elif isinstance(status, UserStatusRecently):
-                return "Recently active"
+                result, ttl = "Recently active", 60.0
             elif isinstance(status, UserStatusLastWeek):
-                return "Active last week"
+                result, ttl = "Active last week", 3600.0
             elif isinstance(status, UserStatusLastMonth):
-                return "Active last month"
+                result, ttl = "Active last month", 3600.0
             else:
                 return "Unknown"
-                
+
+            self._entity_cache[user_id] = (now + ttl, result)
+            while len(self._entity_cache) > self._ENTITY_CACHE_MAX:
+                self._entity_cache.popitem(last=False)
+            return result
+
         except Exception as e:
             logger.warning(f"Could not get user status for {user_id}: {e}")
             return "Unknown"
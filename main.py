@@ -5,16 +5,17 @@ Telegram AI Handler - Main Entry Point
 import asyncio
 import logging
 import os
-from pathlib import Path
 
 from dotenv import load_dotenv
 
+# Load environment variables before app imports so modules that read the
+# environment at import time (e.g. the AI client) see the .env values
+load_dotenv()
+
+from app.ai_client import close_shared_session
 from app.tg_client import TelegramClient
 from app.utils.logging import setup_logging
 
-# Load environment variables
-load_dotenv()
-
 # Setup logging
 ENV = os.getenv("ENV", "dev")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO" if ENV == "prod" else "DEBUG")
@@ -27,14 +28,18 @@ async def main():
     """Main application entry point."""
     logger.info("Starting Telegram AI Handler...")
     
-    # Ensure storage directories exist
-    storage_dirs = ["storage/uploads", "storage/chroma", "storage/logs"]
-    for dir_path in storage_dirs:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
+    # Ensure storage directories exist (os.makedirs skips the Path
+    # object construction)
+    for dir_path in ("storage/uploads", "storage/chroma", "storage/logs"):
+        os.makedirs(dir_path, exist_ok=True)
     
     # Initialize and start Telegram client
     tg_client = TelegramClient()
-    await tg_client.start()
+    try:
+        await tg_client.start()
+    finally:
+        # Release the shared HTTP connection pool on the way out
+        await close_shared_session()
 
 
 if __name__ == "__main__":
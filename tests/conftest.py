@@ -0,0 +1,47 @@
+"""Shared fixtures for the test suite."""
+import hashlib
+
+import numpy as np
+import pytest
+
+from app.memory import long_term
+
+
+class _HashEmbedder:
+    """Deterministic stand-in for the sentence-transformer model.
+
+    Vectors are derived from a hash of the text, so no model is loaded
+    and results are stable across runs; identical texts map to
+    identical vectors, which is all the memory tests need.
+    """
+
+    _DIM = 384
+
+    def encode(self, texts, **kwargs):
+        return np.stack([self._vector(text) for text in texts])
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(
+            hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        vector = np.random.default_rng(seed).standard_normal(self._DIM).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture(scope="session")
+def long_memory_backend():
+    """One in-memory LongTermMemory shared across the whole test run.
+
+    The embedding loaders are stubbed before construction so no model
+    download/load happens, and persist_dir=None selects the in-process
+    NumPy store, so nothing touches the filesystem. Each worker process
+    gets its own store, which keeps runs under pytest-xdist isolated
+    without tmp_path plumbing.
+    """
+    mp = pytest.MonkeyPatch()
+    embedder = _HashEmbedder()
+    mp.setattr(long_term, "_load_embeddings_model", lambda: embedder)
+    mp.setattr(long_term, "_load_message_model", lambda default: default)
+    memory = long_term.LongTermMemory(persist_dir=None)
+    yield memory
+    mp.undo()
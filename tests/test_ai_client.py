@@ -1,80 +1,157 @@
 """Tests for AI client."""
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch
 
-from app.ai_client import AIClient
+import numpy as np
+import orjson
+
+from app.ai_client import AIClient, AIServerError
+
+
+@pytest.fixture(scope="class")
+def event_loop():
+    """One event loop for the whole class instead of one per test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+class _FakeResponse:
+    """Minimal stand-in for an aiohttp response context manager.
+
+    Plain attributes and two tiny coroutines; no mock machinery to
+    configure or to slow down attribute access in the hot retry loop.
+    """
+
+    def __init__(self, status: int, payload: dict = None):
+        self.status = status
+        self.headers = {}
+        self._body = orjson.dumps(payload) if payload is not None else b""
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class _FakeSession:
+    """Returns a canned response from post() and counts the calls."""
+
+    def __init__(self, response: _FakeResponse):
+        self.response = response
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+async def _sleepless(_delay):
+    """No-op replacement for asyncio.sleep so retry tests run instantly."""
+
+
+_CHAT_RESPONSE = {
+    "choices": [
+        {
+            "message": {
+                "content": "Hello! How can I help you?"
+            }
+        }
+    ]
+}
+
+_EMBED_RESPONSE = {
+    "data": [
+        {"embedding": [0.1, 0.2, 0.3]},
+        {"embedding": [0.4, 0.5, 0.6]}
+    ]
+}
 
 
 class TestAIClient:
     """Test AI client functionality."""
-    
-    def setup_method(self):
-        """Setup test environment."""
-        self.client = AIClient()
-        self.client.base_url = "https://api.test.com/v1"
-        self.client.api_key = "test_key"
-        self.client.model = "test-model"
-    
-    @pytest.mark.asyncio
-    async def test_chat_success(self):
-        """Test successful chat completion."""
-        mock_response = {
-            "choices": [
-                {
-                    "message": {
-                        "content": "Hello! How can I help you?"
-                    }
-                }
-            ]
-        }
-        
-        with patch('aiohttp.ClientSession.post') as mock_post:
-            mock_post.return_value.__aenter__.return_value.status = 200
-            mock_post.return_value.__aenter__.return_value.json = AsyncMock(
-                return_value=mock_response
-            )
-            
-            response = await self.client.chat(
-                messages=[{"role": "user", "content": "Hi"}]
-            )
-            
-            assert response == "Hello! How can I help you?"
-    
-    @pytest.mark.asyncio
-    async def test_chat_rate_limit(self):
-        """Test rate limit handling."""
-        with patch('aiohttp.ClientSession.post') as mock_post:
-            mock_post.return_value.__aenter__.return_value.status = 429
-            
-            with pytest.raises(Exception, match="Rate limit exceeded"):
-                await self.client.chat(
-                    messages=[{"role": "user", "content": "Hi"}]
-                )
-    
-    @pytest.mark.asyncio
-    async def test_embed_success(self):
-        """Test successful embedding."""
-        mock_response = {
-            "data": [
-                {"embedding": [0.1, 0.2, 0.3]},
-                {"embedding": [0.4, 0.5, 0.6]}
-            ]
-        }
-        
-        with patch('aiohttp.ClientSession.post') as mock_post:
-            mock_post.return_value.__aenter__.return_value.status = 200
-            mock_post.return_value.__aenter__.return_value.json = AsyncMock(
-                return_value=mock_response
-            )
-            
-            embeddings = await self.client.embed(
-                texts=["Hello", "World"]
-            )
-            
-            assert len(embeddings) == 2
-            assert len(embeddings[0]) == 3
+
+    @pytest.fixture(autouse=True, scope="class")
+    def _client(self, request, event_loop):
+        """Share one configured AIClient across the class."""
+        client = AIClient()
+        client.base_url = "https://api.test.com/v1"
+        client.api_key = "test_key"
+        client.model = "test-model"
+        request.cls.client = client
+        yield
+        # Close the shared session in case a test created a real one
+        event_loop.run_until_complete(client.close())
+
+    @pytest.mark.parametrize(
+        ("method", "status", "payload", "expected"),
+        [
+            pytest.param(
+                "chat", 200, _CHAT_RESPONSE,
+                "Hello! How can I help you?",
+                id="chat-success",
+            ),
+            pytest.param(
+                "chat", 429, None,
+                AIServerError("Rate limit exceeded"),
+                id="chat-rate-limit",
+            ),
+            pytest.param(
+                "embed", 200, _EMBED_RESPONSE,
+                (2, 3),
+                id="embed-success",
+            ),
+        ],
+    )
+    async def test_request(self, monkeypatch, method, status, payload, expected):
+        """Exercise both endpoints and both outcomes through one body."""
+        session = _FakeSession(_FakeResponse(status, payload))
+
+        async def fake_get_session():
+            return session
+
+        monkeypatch.setattr(self.client, "_get_session", fake_get_session)
+        monkeypatch.setattr(asyncio, "sleep", _sleepless)
+
+        if method == "chat":
+            call = self.client.chat(messages=[{"role": "user", "content": "Hi"}])
+        else:
+            call = self.client.embed(texts=["Hello", "World"])
+
+        if isinstance(expected, Exception):
+            with pytest.raises(type(expected), match=str(expected)):
+                await call
+        else:
+            result = await call
+            if method == "embed":
+                assert result.shape == expected
+                assert result.dtype == np.float32
+            else:
+                assert result == expected
+            assert session.calls == 1
+
+    async def test_embed_cache_hit(self, monkeypatch):
+        """Repeat embeds are served from cache with no HTTP call."""
+        session = _FakeSession(_FakeResponse(200, _EMBED_RESPONSE))
+
+        async def fake_get_session():
+            return session
+
+        monkeypatch.setattr(self.client, "_get_session", fake_get_session)
+
+        first = await self.client.embed(texts=["alpha", "beta"])
+        second = await self.client.embed(texts=["alpha", "beta"])
+
+        assert np.array_equal(second, first)
+        assert session.calls == 1
 
 
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
@@ -1,11 +1,12 @@
 """Tests for memory management."""
+import sqlite3
+
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.memory.short_term import ShortTermMemory
-from app.memory.long_term import LongTermMemory
 from app.memory.facts import FactsStore
-from app.storage.db import db
+from app.storage.db import ChatMessage, Database, db
 
 
 class TestShortTermMemory:
@@ -27,30 +28,84 @@ class TestShortTermMemory:
     
     def test_get_recent_messages(self):
         """Test retrieving recent messages."""
-        # Add multiple messages
-        for i in range(3):
-            self.memory.add_message(self.user_id, "user", f"Message {i}")
-        
+        # Add multiple messages in one batch
+        self.memory.bulk_add(self.user_id, [("user", f"Message {i}") for i in range(3)])
+
         messages = self.memory.get_recent_messages(self.user_id)
-        
+
         assert len(messages) == 3
         assert all(m.user_id == self.user_id for m in messages)
-    
+
+    def test_token_window_keeps_newest(self):
+        """When history exceeds the budget, the newest messages win."""
+        user_id = 54321
+        base = datetime.now()
+        db.save_messages([
+            ChatMessage(
+                id=f"{user_id}_tw_{i}",
+                user_id=user_id,
+                role="user",
+                content=f"Message {i}",
+                tokens=100,
+                created_at=base + timedelta(seconds=i),
+            )
+            for i in range(5)
+        ])
+
+        window = db.get_messages_by_tokens(user_id, 250)
+
+        # Two 100-token rows fit: the two newest, in chronological order
+        assert [m.content for m in window] == ["Message 3", "Message 4"]
+
+        db.delete_recent_messages(user_id, 1000)
+
     def test_forget_last(self):
         """Test forgetting messages."""
         # Add messages
-        for i in range(5):
-            self.memory.add_message(self.user_id, "user", f"Message {i}")
-        
+        self.memory.bulk_add(self.user_id, [("user", f"Message {i}") for i in range(5)])
+
         # Forget 2 messages
         deleted = self.memory.forget_last(self.user_id, 2)
         assert deleted == 2
-        
+
         # Check remaining messages
         messages = self.memory.get_recent_messages(self.user_id)
         assert len(messages) == 3
 
 
+class TestTimestampMigration:
+    """Test the init-time rewrite of legacy text timestamps."""
+
+    def test_legacy_rows_parse_and_order(self, tmp_path):
+        """ISO rows and affinity-coerced digit strings become unix ms."""
+        path = str(tmp_path / "legacy.db")
+        old = datetime(2024, 5, 1, 12, 0, 0)
+        new = datetime(2024, 5, 1, 12, 0, 1)
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            CREATE TABLE messages (
+                id TEXT PRIMARY KEY, user_id INTEGER NOT NULL,
+                role TEXT NOT NULL, content TEXT NOT NULL,
+                tokens INTEGER NOT NULL, created_at TEXT NOT NULL
+            );
+        """)
+        # One pre-upgrade ISO row, one post-upgrade integer bind that the
+        # TEXT column stored as a digit string
+        conn.execute("INSERT INTO messages VALUES ('old', 7, 'user', 'old', 10, ?)",
+                     (old.isoformat(),))
+        conn.execute("INSERT INTO messages VALUES ('new', 7, 'user', 'new', 10, ?)",
+                     (int(new.timestamp() * 1000),))
+        conn.commit()
+        conn.close()
+
+        store = Database(path)
+        messages = store.get_recent_messages(7, 10)
+
+        # Newest first, and both rows round-trip their wall time
+        assert [m.id for m in messages] == ["new", "old"]
+        assert [m.created_at for m in messages] == [new, old]
+
+
 class TestFactsStore:
     """Test facts storage functionality."""
     
@@ -69,6 +124,17 @@ class TestFactsStore:
         assert facts[0].value == "Alice"
         assert facts[0].confidence == 0.9
     
+    def test_wipe_clears_cached_facts(self):
+        """Facts must not be served from cache after a full wipe."""
+        self.store.add_fact(self.user_id, "name", "Alice", 0.9)
+        assert self.store.get_facts(self.user_id)
+
+        # /wipe_me deletes the rows and tells the store to drop caches
+        db.delete_all_user_data(self.user_id)
+        self.store.delete_user_facts(self.user_id)
+
+        assert self.store.get_facts(self.user_id) == []
+
     def test_extract_facts(self):
         """Test fact extraction from messages."""
         message = "My name is Bob and I like Python programming"
@@ -81,23 +147,30 @@ class TestFactsStore:
 
 class TestLongTermMemory:
     """Test long-term memory functionality."""
-    
-    def setup_method(self):
-        """Setup test environment."""
-        self.memory = LongTermMemory(persist_dir="./test_chroma")
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, long_memory_backend):
+        """Reuse the session-wide in-memory backend per test."""
+        self.memory = long_memory_backend
         self.user_id = 12345
+        yield
+        self.memory.delete_user_memories(self.user_id)
     
-    def test_add_and_search(self):
+    @pytest.mark.asyncio
+    async def test_add_and_search(self):
         """Test adding and searching memories."""
-        # Add a memory
-        self.memory.add_message(
+        # Add memories through the batched write path
+        await self.memory.add_messages_bulk(
             self.user_id,
-            "I love machine learning and AI",
-            "test_msg_1"
+            [
+                ("test_msg_1", "I love machine learning and AI"),
+                ("test_msg_2", "My favorite food is pizza"),
+            ]
         )
-        
-        # Search for relevant content
-        results = self.memory.search(self.user_id, "machine learning", top_k=1)
-        
-        assert len(results) > 0
-        assert "machine learning" in results[0].text.lower()
\ No newline at end of file
+
+        # Search runs the shortlist pass and the exact rerank
+        results = self.memory.search(self.user_id, "machine learning", top_k=2)
+
+        assert len(results) == 2
+        assert results[0].score >= results[1].score
+        assert any("machine learning" in r.text.lower() for r in results)
\ No newline at end of file
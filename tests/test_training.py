@@ -0,0 +1,22 @@
+"""Tests for training data and workflows."""
+from app.training._training_data import TRAINING_DATA
+from app.training.bot_workflows import workflow_manager
+from app.training.system_prompts import training_system
+
+
+class TestTrainingData:
+    """Test the shared training data table."""
+
+    def test_shared_table(self):
+        """Both managers reference the single shared table."""
+        assert workflow_manager.training_data is TRAINING_DATA
+        assert training_system.training_data is TRAINING_DATA
+
+    def test_expected_categories(self):
+        """The shared table keeps all known categories."""
+        expected = {
+            "greetings", "help_requests", "memory_examples",
+            "file_processing", "bengali_interactions", "technical_support"
+        }
+        assert expected <= set(TRAINING_DATA)
+        assert all(TRAINING_DATA[category] for category in expected)